@@ -1,8 +1,26 @@
-from abc import ABC, abstractmethod
-from typing import Optional
+from bisect import bisect_left
+from typing import Callable, List, Optional
+
+
+_TEMPLATE = "APROVADO pelo {role}: Despesa: R$ {amount:.2f} - {description} (Solicitante: {requester})"
+
+
+def _format_approval(role: str, request: "ExpenseRequest") -> str:
+    return _TEMPLATE.format(
+        role=role,
+        amount=request.amount,
+        description=request.description,
+        requester=request.requester,
+    )
+
+
+def _format_rejection(request: "ExpenseRequest") -> str:
+    return f"Despesa de R$ {request.amount:.2f} rejeitada - valor acima do limite autorizado"
 
 
 class ExpenseRequest:
+    __slots__ = ("amount", "description", "requester")
+
     def __init__(self, amount: float, description: str, requester: str):
         self.amount = amount
         self.description = description
@@ -12,7 +30,12 @@ class ExpenseRequest:
         return f"Despesa: R$ {self.amount:.2f} - {self.description} (Solicitante: {self.requester})"
 
 
-class ApprovalHandler(ABC):
+class ApprovalHandler:
+    __slots__ = ("_next_handler",)
+
+    _ROLE: str
+    _LIMIT: float
+
     def __init__(self):
         self._next_handler: Optional[ApprovalHandler] = None
 
@@ -21,64 +44,83 @@ class ApprovalHandler(ABC):
         return handler
 
     def handle(self, request: ExpenseRequest) -> str:
-        if self.can_approve(request.amount):
-            return self._approve(request)
-        elif self._next_handler:
-            return self._next_handler.handle(request)
-        else:
-            return f"Despesa de R$ {request.amount:.2f} rejeitada - valor acima do limite autorizado"
-
-    @abstractmethod
+        # Percorre a cadeia em um único frame em vez de recursão
+        node: Optional[ApprovalHandler] = self
+        while node is not None:
+            if node.can_approve(request.amount):
+                return node._approve(request)
+            node = node._next_handler
+        return _format_rejection(request)
+
     def can_approve(self, amount: float) -> bool:
-        pass
+        return amount <= self._LIMIT
 
-    @abstractmethod
     def _approve(self, request: ExpenseRequest) -> str:
-        pass
+        return _format_approval(self._ROLE, request)
 
 
 class SupervisorHandler(ApprovalHandler):
-    def can_approve(self, amount: float) -> bool:
-        return amount <= 1000.00
+    __slots__ = ()
 
-    def _approve(self, request: ExpenseRequest) -> str:
-        return f"APROVADO pelo Supervisor: {request}"
+    _ROLE = "Supervisor"
+    _LIMIT = 1000.00
 
 
 class ManagerHandler(ApprovalHandler):
-    def can_approve(self, amount: float) -> bool:
-        return amount <= 5000.00
+    __slots__ = ()
 
-    def _approve(self, request: ExpenseRequest) -> str:
-        return f"APROVADO pelo Gerente: {request}"
+    _ROLE = "Gerente"
+    _LIMIT = 5000.00
 
 
 class DirectorHandler(ApprovalHandler):
-    def can_approve(self, amount: float) -> bool:
-        return amount <= 20000.00
+    __slots__ = ()
 
-    def _approve(self, request: ExpenseRequest) -> str:
-        return f"APROVADO pelo Diretor: {request}"
+    _ROLE = "Diretor"
+    _LIMIT = 20000.00
 
 
 class CEOHandler(ApprovalHandler):
-    def can_approve(self, amount: float) -> bool:
-        return amount <= 100000.00
+    __slots__ = ()
 
-    def _approve(self, request: ExpenseRequest) -> str:
-        return f"APROVADO pelo CEO: {request}"
+    _ROLE = "CEO"
+    _LIMIT = 100000.00
 
 
-# Configuração da cadeia
-def create_approval_chain() -> ApprovalHandler:
-    supervisor = SupervisorHandler()
-    manager = ManagerHandler()
-    director = DirectorHandler()
-    ceo = CEOHandler()
+# Tabela de alçadas derivada dos handlers, na ordem da cadeia (limites crescentes)
+_HANDLERS = (SupervisorHandler, ManagerHandler, DirectorHandler, CEOHandler)
+_AMOUNTS = [handler._LIMIT for handler in _HANDLERS]
+_ROLES = tuple(handler._ROLE for handler in _HANDLERS)
+
+
+def _format_decision(idx: int, request: ExpenseRequest) -> str:
+    if idx == len(_AMOUNTS):
+        return _format_rejection(request)
+    return _format_approval(_ROLES[idx], request)
 
-    supervisor.set_next(manager).set_next(director).set_next(ceo)
 
-    return supervisor
+def _approver_index(amount: float) -> int:
+    # NaN falha em toda comparação, como nos can_approve da cadeia: rejeita antes
+    # da busca binária, que o colocaria no primeiro aprovador
+    if not amount <= _AMOUNTS[-1]:
+        return len(_AMOUNTS)
+    # Busca binária pelo primeiro limite >= valor, equivalente a percorrer a cadeia
+    return bisect_left(_AMOUNTS, amount)
+
+
+def approve(request: ExpenseRequest) -> str:
+    return _format_decision(_approver_index(request.amount), request)
+
+
+def approve_batch(requests: List[ExpenseRequest]) -> List[str]:
+    # Decide todos os aprovadores primeiro e só depois formata as mensagens
+    indexes = [_approver_index(request.amount) for request in requests]
+    return [_format_decision(idx, request) for idx, request in zip(indexes, requests)]
+
+
+# Configuração da cadeia
+def create_approval_chain() -> Callable[[ExpenseRequest], str]:
+    return approve
 
 
 # Exemplo de uso
@@ -92,10 +134,11 @@ def main():
         ExpenseRequest(15000.00, "Software de infraestrutura", "Pedro Costa"),
         ExpenseRequest(50000.00, "Servidor para datacenter", "Ana Oliveira"),
         ExpenseRequest(150000.00, "Aquisição de empresa", "Carlos Lima"),
+        ExpenseRequest(float("nan"), "Valor inválido", "Sistema"),
     ]
 
     for request in requests:
-        result = approval_chain.handle(request)
+        result = approval_chain(request)
         print(result)
         print("-" * 80)
 
@@ -1,47 +1,65 @@
-from abc import ABC, abstractmethod
-from typing import List
+from itertools import chain
+from typing import List, Protocol
 
 
-class Command(ABC):
-    @abstractmethod
-    def execute(self) -> None:
-        pass
+class Command(Protocol):
+    def execute(self) -> None: ...
 
-    @abstractmethod
-    def undo(self) -> None:
-        pass
+    def undo(self) -> None: ...
 
 
 class TextDocument:
+    __slots__ = ("_left", "_right")
+
     def __init__(self):
-        self._content = ""
+        # Gap buffer: texto antes do cursor em _left e depois do cursor em _right (invertido)
+        self._left: List[str] = []
+        self._right: List[str] = []
+
+    def _move_gap_to(self, position: int) -> None:
+        left, right = self._left, self._right
+        if position < len(left):
+            moved = left[position:]
+            del left[position:]
+            right.extend(reversed(moved))
+        elif position > len(left):
+            count = position - len(left)
+            moved = right[-count:]
+            del right[-count:]
+            left.extend(reversed(moved))
 
     def insert_text(self, position: int, text: str) -> None:
-        if 0 <= position <= len(self._content):
-            self._content = self._content[:position] + text + self._content[position:]
+        if 0 <= position <= self.get_length():
+            self._move_gap_to(position)
+            self._left.extend(text)
         else:
             raise ValueError(
-                f"Posição {position} inválida para documento de tamanho {len(self._content)}"
+                f"Posição {position} inválida para documento de tamanho {self.get_length()}"
             )
 
-    def delete_text(self, position: int, length: int) -> str:
-        if position < 0 or position + length > len(self._content):
+    def _check_delete_bounds(self, position: int, length: int) -> None:
+        if position < 0 or position + length > self.get_length():
             raise ValueError(
                 f"Tentativa de deletar texto fora dos limites do documento"
             )
 
-        deleted_text = self._content[position : position + length]
-        self._content = self._content[:position] + self._content[position + length :]
+    def delete_text(self, position: int, length: int) -> str:
+        self._check_delete_bounds(position, length)
+        self._move_gap_to(position + length)
+        deleted_text = "".join(self._left[position:])
+        del self._left[position:]
         return deleted_text
 
     def get_content(self) -> str:
-        return self._content
+        return "".join(chain(self._left, reversed(self._right)))
 
     def get_length(self) -> int:
-        return len(self._content)
+        return len(self._left) + len(self._right)
 
 
-class InsertCommand(Command):
+class InsertCommand:
+    __slots__ = ("_document", "_position", "_text", "_executed")
+
     def __init__(self, document: TextDocument, position: int, text: str):
         self._document = document
         self._position = position
@@ -66,11 +84,15 @@ class InsertCommand(Command):
         return f"InsertCommand(pos={self._position}, text='{self._text}')"
 
 
-class DeleteCommand(Command):
+class DeleteCommand:
+    __slots__ = ("_document", "_position", "_length", "_deleted_text", "_executed")
+
     def __init__(self, document: TextDocument, position: int, length: int):
         self._document = document
         self._position = position
         self._length = length
+        # Trecho removido guardado como str compacta no próprio comando: sai da
+        # memória junto com o comando quando o histórico é truncado
         self._deleted_text = ""
         self._executed = False
 
@@ -86,17 +108,45 @@ class DeleteCommand(Command):
             raise RuntimeError("Comando não foi executado ainda")
 
         self._document.insert_text(self._position, self._deleted_text)
+        # O redo apaga de novo e recupera o trecho; não há por que retê-lo
+        self._deleted_text = ""
         self._executed = False
 
     def __str__(self) -> str:
         return f"DeleteCommand(pos={self._position}, length={self._length})"
 
 
-class MacroCommand(Command):
+class MacroCommand:
+    __slots__ = ("_original_commands", "_commands", "_executed")
+
     def __init__(self, commands: List[Command]):
-        self._commands = commands.copy()
+        self._original_commands = commands.copy()
+        self._commands = self._collapse_inserts(self._original_commands)
         self._executed = False
 
+    @staticmethod
+    def _collapse_inserts(commands: List[Command]) -> List[Command]:
+        # Funde inserções consecutivas e contíguas em uma única InsertCommand
+        collapsed: List[Command] = []
+        for command in commands:
+            previous = collapsed[-1] if collapsed else None
+            if (
+                isinstance(command, InsertCommand)
+                and isinstance(previous, InsertCommand)
+                and not command._executed
+                and not previous._executed
+                and command._document is previous._document
+                and command._position == previous._position + len(previous._text)
+            ):
+                collapsed[-1] = InsertCommand(
+                    previous._document,
+                    previous._position,
+                    previous._text + command._text,
+                )
+            else:
+                collapsed.append(command)
+        return collapsed
+
     def execute(self) -> None:
         if self._executed:
             raise RuntimeError("Macro já foi executado")
@@ -115,7 +165,7 @@ class MacroCommand(Command):
         self._executed = False
 
     def __str__(self) -> str:
-        return f"MacroCommand({len(self._commands)} comandos)"
+        return f"MacroCommand({len(self._original_commands)} comandos)"
 
 
 class TextEditor:
@@ -126,7 +176,7 @@ class TextEditor:
 
     def execute_command(self, command: Command) -> None:
         # Remove comandos após a posição atual (para casos de undo seguido de nova operação)
-        self._command_history = self._command_history[: self._current_position + 1]
+        del self._command_history[self._current_position + 1 :]
 
         # Executa o comando
         command.execute()
@@ -1,26 +1,28 @@
-from abc import ABC, abstractmethod
-from typing import Any, Dict
+import logging
+import sys
+from operator import itemgetter
+from typing import Any, Dict, Protocol
+
+log = logging.getLogger(__name__)
 
 
 # Interface comum para processamento de pagamentos
-class PaymentProcessor(ABC):
-    @abstractmethod
-    def process_payment(self, amount: float, payment_data: Dict[str, Any]) -> bool:
-        pass
+class PaymentProcessor(Protocol):
+    def process_payment(self, amount: float, payment_data: Dict[str, Any]) -> bool: ...
 
 
 # Serviços externos com interfaces diferentes
 class PayPalService:
     def makePayment(self, amount: float, currency: str, email: str) -> Dict[str, Any]:
         # Simulação da API do PayPal
-        print(f"PayPal: Processing ${amount} {currency} for {email}")
+        log.debug("PayPal: Processing $%s %s for %s", amount, currency, email)
         return {"status": "success", "transaction_id": "pp_12345"}
 
 
 class StripeService:
     def charge(self, price_in_cents: int, card_token: str) -> Dict[str, Any]:
         # Simulação da API do Stripe
-        print(f"Stripe: Charging {price_in_cents} cents with token {card_token}")
+        log.debug("Stripe: Charging %s cents with token %s", price_in_cents, card_token)
         return {"paid": True, "id": "ch_1234567890"}
 
 
@@ -29,12 +31,14 @@ class PagSeguroService:
         self, valor: float, tipo_cartao: str, dados_cartao: Dict[str, str]
     ) -> Dict[str, Any]:
         # Simulação da API do PagSeguro
-        print(f"PagSeguro: Processando R${valor} via {tipo_cartao}")
+        log.debug("PagSeguro: Processando R$%s via %s", valor, tipo_cartao)
         return {"sucesso": True, "codigo_transacao": "ps_98765"}
 
 
 # Adapters para cada serviço
-class PayPalAdapter(PaymentProcessor):
+class PayPalAdapter:
+    __slots__ = ("paypal_service",)
+
     def __init__(self, paypal_service: PayPalService):
         self.paypal_service = paypal_service
 
@@ -50,7 +54,9 @@ class PayPalAdapter(PaymentProcessor):
             return False
 
 
-class StripeAdapter(PaymentProcessor):
+class StripeAdapter:
+    __slots__ = ("stripe_service",)
+
     def __init__(self, stripe_service: StripeService):
         self.stripe_service = stripe_service
 
@@ -66,18 +72,21 @@ class StripeAdapter(PaymentProcessor):
             return False
 
 
-class PagSeguroAdapter(PaymentProcessor):
+# Os dados do cartão são obrigatórios para o PagSeguro
+_get_card_fields = itemgetter("card_number", "cvv", "cardholder_name")
+
+
+class PagSeguroAdapter:
+    __slots__ = ("pagseguro_service",)
+
     def __init__(self, pagseguro_service: PagSeguroService):
         self.pagseguro_service = pagseguro_service
 
     def process_payment(self, amount: float, payment_data: Dict[str, Any]) -> bool:
         try:
             tipo_cartao = payment_data.get("card_type", "credito")
-            dados_cartao = {
-                "numero": payment_data.get("card_number"),
-                "cvv": payment_data.get("cvv"),
-                "titular": payment_data.get("cardholder_name"),
-            }
+            numero, cvv, titular = _get_card_fields(payment_data)
+            dados_cartao = {"numero": numero, "cvv": cvv, "titular": titular}
 
             result = self.pagseguro_service.processPagamento(
                 amount, tipo_cartao, dados_cartao
@@ -109,6 +118,8 @@ class ECommerceSystem:
 
 # Exemplo de uso
 def main():
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Criando instâncias dos serviços externos
     paypal = PayPalService()
     stripe = StripeService()
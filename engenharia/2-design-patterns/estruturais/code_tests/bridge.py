@@ -1,175 +1,209 @@
-from abc import ABC, abstractmethod
+import logging
+import sys
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
 
 
 # Implementor - Interface para provedores de notificação
-class NotificationProvider(ABC):
-    @abstractmethod
+class NotificationProvider:
+    __slots__ = ()
+
     def send_email(self, to: str, subject: str, body: str) -> bool:
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def send_sms(self, to: str, message: str) -> bool:
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def send_push(
         self, token: str, title: str, body: str, data: Dict[str, Any] = None
     ) -> bool:
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def schedule_notification(
         self, notification_type: str, recipient: str, message: str, send_at: datetime
     ) -> bool:
-        pass
+        raise NotImplementedError
+
+    def send_sms_batch(self, recipients: List[str], message: str) -> Dict[str, bool]:
+        # Provedores sem envio em lote caem no envio individual
+        return {
+            recipient: self.send_sms(recipient, message) for recipient in recipients
+        }
 
 
 # Concrete Implementors - Diferentes provedores
 class AWSProvider(NotificationProvider):
+    __slots__ = ("region",)
+
     def __init__(self, region: str = "us-east-1"):
         self.region = region
-        print(f"AWS Provider initialized for region {region}")
+        log.debug("AWS Provider initialized for region %s", region)
 
     def send_email(self, to: str, subject: str, body: str) -> bool:
-        print(f"AWS SES: Sending email to {to}")
-        print(f"Subject: {subject}")
+        log.debug("AWS SES: Sending email to %s", to)
+        log.debug("Subject: %s", subject)
         # Simulação da API do AWS SES
         return True
 
     def send_sms(self, to: str, message: str) -> bool:
-        print(f"AWS SNS: Sending SMS to {to}")
-        print(f"Message: {message}")
+        log.debug("AWS SNS: Sending SMS to %s", to)
+        log.debug("Message: %s", message)
         # Simulação da API do AWS SNS
         return True
 
     def send_push(
         self, token: str, title: str, body: str, data: Dict[str, Any] = None
     ) -> bool:
-        print(f"AWS SNS: Sending push notification to {token}")
-        print(f"Title: {title}, Body: {body}")
+        log.debug("AWS SNS: Sending push notification to %s", token)
+        log.debug("Title: %s, Body: %s", title, body)
         return True
 
     def schedule_notification(
         self, notification_type: str, recipient: str, message: str, send_at: datetime
     ) -> bool:
-        print(f"AWS EventBridge: Scheduling {notification_type} for {send_at}")
+        log.debug("AWS EventBridge: Scheduling %s for %s", notification_type, send_at)
         return True
 
 
 class SendGridProvider(NotificationProvider):
+    __slots__ = ("api_key",)
+
+    _SUPPORTED_SCHEDULE = frozenset({"email"})
+
     def __init__(self, api_key: str):
         self.api_key = api_key
-        print("SendGrid Provider initialized")
+        log.debug("SendGrid Provider initialized")
 
     def send_email(self, to: str, subject: str, body: str) -> bool:
-        print(f"SendGrid: Sending email to {to}")
-        print(f"Subject: {subject}")
+        log.debug("SendGrid: Sending email to %s", to)
+        log.debug("Subject: %s", subject)
         # Simulação da API do SendGrid
         return True
 
     def send_sms(self, to: str, message: str) -> bool:
-        print("SendGrid: SMS not supported, delegating to Twilio")
+        log.debug("SendGrid: SMS not supported, delegating to Twilio")
         return False
 
     def send_push(
         self, token: str, title: str, body: str, data: Dict[str, Any] = None
     ) -> bool:
-        print("SendGrid: Push notifications not supported")
+        log.debug("SendGrid: Push notifications not supported")
         return False
 
     def schedule_notification(
         self, notification_type: str, recipient: str, message: str, send_at: datetime
     ) -> bool:
-        if notification_type == "email":
-            print(f"SendGrid: Scheduling email for {send_at}")
+        if notification_type in self._SUPPORTED_SCHEDULE:
+            log.debug("SendGrid: Scheduling email for %s", send_at)
             return True
         return False
 
 
 class TwilioProvider(NotificationProvider):
+    __slots__ = ("account_sid", "auth_token")
+
+    _SUPPORTED_SCHEDULE = frozenset({"sms"})
+
     def __init__(self, account_sid: str, auth_token: str):
         self.account_sid = account_sid
         self.auth_token = auth_token
-        print("Twilio Provider initialized")
+        log.debug("Twilio Provider initialized")
 
     def send_email(self, to: str, subject: str, body: str) -> bool:
-        print("Twilio: Email not supported via Twilio directly")
+        log.debug("Twilio: Email not supported via Twilio directly")
         return False
 
     def send_sms(self, to: str, message: str) -> bool:
-        print(f"Twilio: Sending SMS to {to}")
-        print(f"Message: {message}")
+        log.debug("Twilio: Sending SMS to %s", to)
+        log.debug("Message: %s", message)
         # Simulação da API do Twilio
         return True
 
+    def send_sms_batch(self, recipients: List[str], message: str) -> Dict[str, bool]:
+        log.debug("Twilio: Sending SMS batch to %s recipients", len(recipients))
+        log.debug("Message: %s", message)
+        # Simulação da API de envio em lote do Twilio
+        return {recipient: True for recipient in recipients}
+
     def send_push(
         self, token: str, title: str, body: str, data: Dict[str, Any] = None
     ) -> bool:
-        print("Twilio: Push notifications not directly supported")
+        log.debug("Twilio: Push notifications not directly supported")
         return False
 
     def schedule_notification(
         self, notification_type: str, recipient: str, message: str, send_at: datetime
     ) -> bool:
-        if notification_type == "sms":
-            print(f"Twilio: Scheduling SMS for {send_at}")
+        if notification_type in self._SUPPORTED_SCHEDULE:
+            log.debug("Twilio: Scheduling SMS for %s", send_at)
             return True
         return False
 
 
 class FirebaseProvider(NotificationProvider):
+    __slots__ = ("project_id",)
+
+    _SUPPORTED_SCHEDULE = frozenset({"push"})
+
     def __init__(self, project_id: str):
         self.project_id = project_id
-        print(f"Firebase Provider initialized for project {project_id}")
+        log.debug("Firebase Provider initialized for project %s", project_id)
 
     def send_email(self, to: str, subject: str, body: str) -> bool:
-        print("Firebase: Email not supported, use Firebase Extensions")
+        log.debug("Firebase: Email not supported, use Firebase Extensions")
         return False
 
     def send_sms(self, to: str, message: str) -> bool:
-        print("Firebase: SMS not directly supported")
+        log.debug("Firebase: SMS not directly supported")
         return False
 
     def send_push(
         self, token: str, title: str, body: str, data: Dict[str, Any] = None
     ) -> bool:
-        print(f"Firebase FCM: Sending push to {token}")
-        print(f"Title: {title}, Body: {body}")
+        log.debug("Firebase FCM: Sending push to %s", token)
+        log.debug("Title: %s, Body: %s", title, body)
         if data:
-            print(f"Data: {data}")
+            log.debug("Data: %s", data)
         return True
 
     def schedule_notification(
         self, notification_type: str, recipient: str, message: str, send_at: datetime
     ) -> bool:
-        if notification_type == "push":
-            print(f"Firebase: Scheduling push notification for {send_at}")
+        if notification_type in self._SUPPORTED_SCHEDULE:
+            log.debug("Firebase: Scheduling push notification for %s", send_at)
             return True
         return False
 
 
 # Abstraction - Classe base para notificações
-class NotificationSender(ABC):
+class NotificationSender:
+    __slots__ = ("provider",)
+
+    _NOTIFICATION_TYPE: str = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Deriva o tipo ("email", "sms", "push") do nome da classe uma única vez
+        cls._NOTIFICATION_TYPE = cls.__name__.lower().replace("notification", "")
+
     def __init__(self, provider: NotificationProvider):
         self.provider = provider
 
-    @abstractmethod
     def send(self, recipient: str, message: str) -> bool:
-        pass
+        raise NotImplementedError
 
     def schedule(self, recipient: str, message: str, send_at: datetime) -> bool:
         return self.provider.schedule_notification(
-            self.__class__.__name__.lower().replace("notification", ""),
-            recipient,
-            message,
-            send_at,
+            self._NOTIFICATION_TYPE, recipient, message, send_at
         )
 
 
 # Refined Abstractions - Implementações específicas
 class EmailNotification(NotificationSender):
+    __slots__ = ()
+
     def send(self, recipient: str, message: str, subject: str = "Notification") -> bool:
         return self.provider.send_email(recipient, subject, message)
 
@@ -181,20 +215,25 @@ class EmailNotification(NotificationSender):
 
 
 class SMSNotification(NotificationSender):
-    def send(self, recipient: str, message: str) -> bool:
+    __slots__ = ()
+
+    @staticmethod
+    def _truncate(message: str) -> str:
         # SMS tem limite de caracteres
         if len(message) > 160:
-            message = message[:157] + "..."
-        return self.provider.send_sms(recipient, message)
+            return message[:157] + "..."
+        return message
+
+    def send(self, recipient: str, message: str) -> bool:
+        return self.provider.send_sms(recipient, self._truncate(message))
 
     def send_batch(self, recipients: List[str], message: str) -> Dict[str, bool]:
-        results = {}
-        for recipient in recipients:
-            results[recipient] = self.send(recipient, message)
-        return results
+        return self.provider.send_sms_batch(recipients, self._truncate(message))
 
 
 class PushNotification(NotificationSender):
+    __slots__ = ()
+
     def send(
         self,
         recipient: str,
@@ -212,36 +251,48 @@ class PushNotification(NotificationSender):
 # Sistema cliente que usa as notificações
 class NotificationManager:
     def __init__(self):
-        self.notification_senders = {}
+        self.notification_senders: Dict[
+            str, Tuple[NotificationSender, Callable[[str, str, Dict[str, Any]], bool]]
+        ] = {}
 
     def register_sender(self, name: str, sender: NotificationSender):
-        self.notification_senders[name] = sender
-
-    def send_notification(
-        self, sender_name: str, recipient: str, message: str, **kwargs
-    ) -> bool:
-        if sender_name not in self.notification_senders:
-            print(f"Sender {sender_name} not registered")
-            return False
+        self.notification_senders[name] = (sender, self._make_adapter(sender))
 
-        sender = self.notification_senders[sender_name]
+    @staticmethod
+    def _make_adapter(
+        sender: NotificationSender,
+    ) -> Callable[[str, str, Dict[str, Any]], bool]:
+        # Resolve uma única vez como repassar os kwargs para cada tipo de sender
         if isinstance(sender, EmailNotification):
-            return sender.send(
+            return lambda recipient, message, kwargs: sender.send(
                 recipient, message, kwargs.get("subject", "Notification")
             )
         elif isinstance(sender, PushNotification):
-            return sender.send(
+            return lambda recipient, message, kwargs: sender.send(
                 recipient,
                 message,
                 kwargs.get("title", "Notification"),
                 kwargs.get("data"),
             )
         else:
-            return sender.send(recipient, message)
+            return lambda recipient, message, kwargs: sender.send(recipient, message)
+
+    def send_notification(
+        self, sender_name: str, recipient: str, message: str, **kwargs
+    ) -> bool:
+        entry = self.notification_senders.get(sender_name)
+        if entry is None:
+            print(f"Sender {sender_name} not registered")
+            return False
+
+        _, adapter = entry
+        return adapter(recipient, message, kwargs)
 
 
 # Exemplo de uso
 def main():
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Criando diferentes provedores
     aws_provider = AWSProvider("us-west-2")
     sendgrid_provider = SendGridProvider("sg_api_key_123")
@@ -1,23 +1,110 @@
+import io
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from bisect import bisect_right, insort
+from contextlib import redirect_stdout
+from math import inf
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+_EMPTY_CHILDREN: Tuple["UIComponent", ...] = ()
+
+
+def _iter_children(component: "UIComponent") -> Sequence["UIComponent"]:
+    """Acessa os filhos diretamente, sem copiar a lista"""
+    return getattr(component, "_children", _EMPTY_CHILDREN)
 
 
 # Component - Interface comum para objetos simples e compostos
 class UIComponent(ABC):
+    __slots__ = (
+        "_x",
+        "_y",
+        "_width",
+        "_height",
+        "_bounds",
+        "_bounds_cache",
+        "_parent",
+    )
+
     def __init__(self, x: int, y: int, width: int, height: int):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
+        self._x = x
+        self._y = y
+        self._width = width
+        self._height = height
+        # Container (ou renderer) cujo índice espacial depende destes limites
+        self._parent: Any = None
+        self._invalidate_bounds()
+
+    def _invalidate_bounds(self) -> None:
+        """Recalcula os limites em cache após mudança de posição ou tamanho"""
+        x, y = self._x, self._y
+        self._bounds = (x, y, self._width, self._height)
+        self._bounds_cache = (x, y, x + self._width, y + self._height)
+        # Só o índice do pai direto fica sujo: os limites do pai não mudam,
+        # então os índices dos ancestrais acima dele continuam válidos
+        if self._parent is not None:
+            self._parent._child_bounds_changed()
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self._x = value
+        self._invalidate_bounds()
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self._y = value
+        self._invalidate_bounds()
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @width.setter
+    def width(self, value: int) -> None:
+        self._width = value
+        self._invalidate_bounds()
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @height.setter
+    def height(self, value: int) -> None:
+        self._height = value
+        self._invalidate_bounds()
 
     @abstractmethod
     def render(self) -> None:
         """Renderiza o componente na tela"""
         pass
 
+    def _render(self, out: List[str]) -> None:
+        """Acrescenta as linhas renderizadas do componente em out"""
+        # Padrão para subclasses que só implementam render(): captura o que ele
+        # imprime, preservando a ordem em relação ao restante do buffer
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            self.render()
+        out.extend(buffer.getvalue().splitlines())
+
+    def _write_rendered(self) -> None:
+        """Monta as linhas via _render e as escreve de uma só vez"""
+        out: List[str] = []
+        self._render(out)
+        sys.stdout.write("\n".join(out) + "\n")
+
     def get_bounds(self) -> Tuple[int, int, int, int]:
         """Retorna as coordenadas e dimensões do componente"""
-        return (self.x, self.y, self.width, self.height)
+        return self._bounds
 
     @abstractmethod
     def handle_click(self, x: int, y: int) -> bool:
@@ -26,9 +113,8 @@ class UIComponent(ABC):
 
     def is_point_inside(self, x: int, y: int) -> bool:
         """Verifica se um ponto está dentro dos limites do componente"""
-        return (
-            self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
-        )
+        x0, y0, x1, y1 = self._bounds_cache
+        return x0 <= x <= x1 and y0 <= y <= y1
 
     # Métodos para composição - implementação padrão para folhas
     def add(self, component: "UIComponent") -> None:
@@ -39,20 +125,89 @@ class UIComponent(ABC):
         """Remove um componente filho (para composites)"""
         raise NotImplementedError("Cannot remove components from a leaf component")
 
-    def get_children(self) -> List["UIComponent"]:
-        """Retorna lista de componentes filhos"""
-        return []
+    def get_children(self) -> Tuple["UIComponent", ...]:
+        """Retorna os componentes filhos (somente leitura)"""
+        return _EMPTY_CHILDREN
+
+    def get_children_copy(self) -> List["UIComponent"]:
+        """Retorna uma cópia da lista de filhos, segura para modificação"""
+        return list(self.get_children())
+
+
+def _spread_bits(n: int) -> int:
+    """Intercala zeros entre os bits de um inteiro de 32 bits"""
+    n &= 0xFFFFFFFF
+    n = (n | (n << 16)) & 0x0000FFFF0000FFFF
+    n = (n | (n << 8)) & 0x00FF00FF00FF00FF
+    n = (n | (n << 4)) & 0x0F0F0F0F0F0F0F0F
+    n = (n | (n << 2)) & 0x3333333333333333
+    n = (n | (n << 1)) & 0x5555555555555555
+    return n
+
+
+def _zcode(x: int, y: int) -> int:
+    """Código Morton (Z-order) de um ponto; coordenadas negativas viram 0"""
+    x = min(max(int(x), 0), 0xFFFFFFFF)
+    y = min(max(int(y), 0), 0xFFFFFFFF)
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+class _ZIndex:
+    """Filhos de um container ordenados pelo código Morton do canto superior esquerdo.
+
+    Um filho só contém o ponto (x, y) se seu canto estiver em (x0 <= x, y0 <= y),
+    e nesse caso seu código Morton é <= ao do ponto: basta olhar o prefixo do índice.
+    """
+
+    __slots__ = ("_entries", "_valid")
+
+    def __init__(self):
+        self._entries: List[Tuple[int, int, UIComponent]] = []
+        self._valid = False
+
+    def invalidate(self) -> None:
+        self._valid = False
+
+    def add(self, component: UIComponent, seq: int) -> None:
+        if self._valid:
+            insort(self._entries, (_zcode(component.x, component.y), seq, component))
+
+    def hits(
+        self, children: List[UIComponent], x: int, y: int
+    ) -> List[UIComponent]:
+        """Filhos que contêm o ponto, do último inserido para o primeiro (z-order)"""
+        if not self._valid:
+            self._entries = sorted(
+                (_zcode(child.x, child.y), seq, child)
+                for seq, child in enumerate(children)
+            )
+            self._valid = True
+
+        entries = self._entries
+        end = bisect_right(entries, (_zcode(x, y), inf))
+        found = [
+            (seq, child)
+            for _, seq, child in (entries[i] for i in range(end))
+            if child.is_point_inside(x, y)
+        ]
+        found.sort(reverse=True)
+        return [child for _, child in found]
 
 
 # Leaf Components - Componentes simples (folhas)
 class Button(UIComponent):
+    __slots__ = ("text", "on_click")
+
     def __init__(self, x: int, y: int, width: int, height: int, text: str):
         super().__init__(x, y, width, height)
         self.text = text
         self.on_click: Optional[Callable] = None
 
     def render(self) -> None:
-        print(
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
+        out.append(
             f"Rendering Button at ({self.x}, {self.y}) "
             f"size {self.width}x{self.height} with text '{self.text}'"
         )
@@ -70,14 +225,28 @@ class Button(UIComponent):
 
 
 class TextField(UIComponent):
-    def __init__(self, x: int, y: int, width: int, height: int, placeholder: str = ""):
+    __slots__ = ("text", "placeholder", "name")
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        placeholder: str = "",
+        name: Optional[str] = None,
+    ):
         super().__init__(x, y, width, height)
         self.text = ""
         self.placeholder = placeholder
+        self.name = name  # Usado na validação e submissão de formulários
 
     def render(self) -> None:
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
         display_text = self.text if self.text else f"[{self.placeholder}]"
-        print(
+        out.append(
             f"Rendering TextField at ({self.x}, {self.y}) "
             f"size {self.width}x{self.height} with text '{display_text}'"
         )
@@ -96,6 +265,8 @@ class TextField(UIComponent):
 
 
 class Label(UIComponent):
+    __slots__ = ("text", "font_size")
+
     def __init__(
         self, x: int, y: int, width: int, height: int, text: str, font_size: int = 12
     ):
@@ -104,7 +275,10 @@ class Label(UIComponent):
         self.font_size = font_size
 
     def render(self) -> None:
-        print(
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
+        out.append(
             f"Rendering Label at ({self.x}, {self.y}) "
             f"size {self.width}x{self.height} with text '{self.text}' (font: {self.font_size}px)"
         )
@@ -119,28 +293,34 @@ class Label(UIComponent):
 
 # Composite Components - Containers que podem conter outros componentes
 class Panel(UIComponent):
+    __slots__ = ("_children", "_zindex", "background_color")
+
     def __init__(
         self, x: int, y: int, width: int, height: int, background_color: str = "white"
     ):
         super().__init__(x, y, width, height)
-        self.children: List[UIComponent] = []
+        self._children: List[UIComponent] = []
+        self._zindex = _ZIndex()
         self.background_color = background_color
 
     def render(self) -> None:
-        print(
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
+        out.append(
             f"Rendering Panel at ({self.x}, {self.y}) "
             f"size {self.width}x{self.height} (background: {self.background_color})"
         )
-        print("  Panel contents:")
-        for child in self.children:
-            child.render()
+        out.append("  Panel contents:")
+        for child in self._children:
+            child._render(out)
 
     def handle_click(self, x: int, y: int) -> bool:
         if not self.is_point_inside(x, y):
             return False
 
         # Propaga o clique para os filhos (do último para o primeiro - z-order)
-        for child in reversed(self.children):
+        for child in self._zindex.hits(self._children, x, y):
             if child.handle_click(x, y):
                 return True
 
@@ -148,20 +328,30 @@ class Panel(UIComponent):
         return True
 
     def add(self, component: UIComponent) -> None:
-        self.children.append(component)
+        self._children.append(component)
+        component._parent = self
+        self._zindex.add(component, len(self._children) - 1)
 
     def remove(self, component: UIComponent) -> None:
-        if component in self.children:
-            self.children.remove(component)
+        if component in self._children:
+            self._children.remove(component)
+            component._parent = None
+            self._zindex.invalidate()
+
+    def get_children(self) -> Tuple[UIComponent, ...]:
+        # Tupla: alterar a lista viva pularia a manutenção do _zindex
+        return tuple(self._children)
 
-    def get_children(self) -> List[UIComponent]:
-        return self.children.copy()
+    def _child_bounds_changed(self) -> None:
+        self._zindex.invalidate()
 
     def set_background_color(self, color: str) -> None:
         self.background_color = color
 
 
 class Window(UIComponent):
+    __slots__ = ("_children", "_zindex", "title", "is_resizable")
+
     def __init__(
         self,
         x: int,
@@ -172,18 +362,22 @@ class Window(UIComponent):
         is_resizable: bool = True,
     ):
         super().__init__(x, y, width, height)
-        self.children: List[UIComponent] = []
+        self._children: List[UIComponent] = []
+        self._zindex = _ZIndex()
         self.title = title
         self.is_resizable = is_resizable
 
     def render(self) -> None:
-        print(
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
+        out.append(
             f"Rendering Window '{self.title}' at ({self.x}, {self.y}) "
             f"size {self.width}x{self.height} (resizable: {self.is_resizable})"
         )
-        print("  Window contents:")
-        for child in self.children:
-            child.render()
+        out.append("  Window contents:")
+        for child in self._children:
+            child._render(out)
 
     def handle_click(self, x: int, y: int) -> bool:
         if not self.is_point_inside(x, y):
@@ -195,21 +389,29 @@ class Window(UIComponent):
             return True
 
         # Propaga para os filhos
-        for child in reversed(self.children):
+        for child in self._zindex.hits(self._children, x, y):
             if child.handle_click(x, y):
                 return True
 
         return True
 
     def add(self, component: UIComponent) -> None:
-        self.children.append(component)
+        self._children.append(component)
+        component._parent = self
+        self._zindex.add(component, len(self._children) - 1)
 
     def remove(self, component: UIComponent) -> None:
-        if component in self.children:
-            self.children.remove(component)
+        if component in self._children:
+            self._children.remove(component)
+            component._parent = None
+            self._zindex.invalidate()
+
+    def get_children(self) -> Tuple[UIComponent, ...]:
+        # Tupla: alterar a lista viva pularia a manutenção do _zindex
+        return tuple(self._children)
 
-    def get_children(self) -> List[UIComponent]:
-        return self.children.copy()
+    def _child_bounds_changed(self) -> None:
+        self._zindex.invalidate()
 
     def set_title(self, title: str) -> None:
         self.title = title
@@ -219,51 +421,76 @@ class Window(UIComponent):
 
 
 class Form(UIComponent):
+    __slots__ = ("_children", "_zindex", "validation_rules", "_text_fields")
+
     def __init__(self, x: int, y: int, width: int, height: int):
         super().__init__(x, y, width, height)
-        self.children: List[UIComponent] = []
+        self._children: List[UIComponent] = []
+        self._zindex = _ZIndex()
         self.validation_rules: Dict[str, Callable] = {}
+        # Campos de texto e seus nomes, mantidos em add/remove
+        self._text_fields: List[Tuple[TextField, str]] = []
 
     def render(self) -> None:
-        print(f"Rendering Form at ({self.x}, {self.y}) size {self.width}x{self.height}")
-        print("  Form contents:")
-        for child in self.children:
-            child.render()
+        self._write_rendered()
+
+    def _render(self, out: List[str]) -> None:
+        out.append(
+            f"Rendering Form at ({self.x}, {self.y}) size {self.width}x{self.height}"
+        )
+        out.append("  Form contents:")
+        for child in self._children:
+            child._render(out)
 
     def handle_click(self, x: int, y: int) -> bool:
         if not self.is_point_inside(x, y):
             return False
 
-        for child in reversed(self.children):
+        for child in self._zindex.hits(self._children, x, y):
             if child.handle_click(x, y):
                 return True
 
         return True
 
     def add(self, component: UIComponent) -> None:
-        self.children.append(component)
+        self._children.append(component)
+        component._parent = self
+        self._zindex.add(component, len(self._children) - 1)
+        if isinstance(component, TextField):
+            name = component.name
+            if name is None:
+                name = f"field_{id(component)}"
+            self._text_fields.append((component, name))
 
     def remove(self, component: UIComponent) -> None:
-        if component in self.children:
-            self.children.remove(component)
-
-    def get_children(self) -> List[UIComponent]:
-        return self.children.copy()
+        if component in self._children:
+            self._children.remove(component)
+            component._parent = None
+            self._zindex.invalidate()
+            if isinstance(component, TextField):
+                self._text_fields = [
+                    entry for entry in self._text_fields if entry[0] is not component
+                ]
+
+    def get_children(self) -> Tuple[UIComponent, ...]:
+        # Tupla: alterar a lista viva pularia a manutenção do _zindex
+        return tuple(self._children)
+
+    def _child_bounds_changed(self) -> None:
+        self._zindex.invalidate()
 
     def validate(self) -> bool:
         """Valida todos os campos do formulário"""
         print("Validating form...")
         valid = True
 
-        for child in self.children:
-            if isinstance(child, TextField):
-                field_name = getattr(child, "name", "unknown")
-                if field_name in self.validation_rules:
-                    if not self.validation_rules[field_name](child.get_text()):
-                        print(f"  Validation failed for field '{field_name}'")
-                        valid = False
-                    else:
-                        print(f"  Field '{field_name}' is valid")
+        for child, field_name in self._text_fields:
+            if field_name in self.validation_rules:
+                if not self.validation_rules[field_name](child.get_text()):
+                    print(f"  Validation failed for field '{field_name}'")
+                    valid = False
+                else:
+                    print(f"  Field '{field_name}' is valid")
 
         return valid
 
@@ -273,39 +500,134 @@ class Form(UIComponent):
             print("Form submission failed - validation errors")
             return {}
 
-        data = {}
-        for child in self.children:
-            if isinstance(child, TextField):
-                field_name = getattr(child, "name", f"field_{id(child)}")
-                data[field_name] = child.get_text()
+        data = {name: child.text for child, name in self._text_fields}
 
         print(f"Form submitted successfully with data: {data}")
         return data
 
 
+# Índice espacial (quadtree) dos componentes raiz para acelerar o hit-testing
+class _QuadTree:
+    __slots__ = ("bounds", "depth", "items", "quadrants")
+
+    MAX_ITEMS = 8
+    MAX_DEPTH = 8
+
+    def __init__(self, bounds: Tuple[int, int, int, int], depth: int = 0):
+        self.bounds = bounds
+        self.depth = depth
+        self.items: List[Tuple[int, Tuple[int, int, int, int], UIComponent]] = []
+        self.quadrants: Optional[List["_QuadTree"]] = None
+
+    def _quadrant_for(self, box: Tuple[int, int, int, int]) -> Optional["_QuadTree"]:
+        """Retorna o quadrante que contém a caixa inteira, se houver"""
+        # Quadrantes semiabertos: caixas que tocam a divisão ficam no nó atual
+        for quadrant in self.quadrants:
+            qx0, qy0, qx1, qy1 = quadrant.bounds
+            if qx0 <= box[0] and qy0 <= box[1] and box[2] < qx1 and box[3] < qy1:
+                return quadrant
+        return None
+
+    def _split(self) -> None:
+        x0, y0, x1, y1 = self.bounds
+        mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+        depth = self.depth + 1
+        self.quadrants = [
+            _QuadTree((x0, y0, mx, my), depth),
+            _QuadTree((mx, y0, x1, my), depth),
+            _QuadTree((x0, my, mx, y1), depth),
+            _QuadTree((mx, my, x1, y1), depth),
+        ]
+        items, self.items = self.items, []
+        for item in items:
+            self.insert(*item)
+
+    def insert(
+        self, order: int, box: Tuple[int, int, int, int], component: UIComponent
+    ) -> None:
+        if self.quadrants is not None:
+            quadrant = self._quadrant_for(box)
+            if quadrant is not None:
+                quadrant.insert(order, box, component)
+                return
+        self.items.append((order, box, component))
+        if (
+            self.quadrants is None
+            and len(self.items) > self.MAX_ITEMS
+            and self.depth < self.MAX_DEPTH
+        ):
+            self._split()
+
+    def query(
+        self, x: int, y: int
+    ) -> List[Tuple[int, Tuple[int, int, int, int], UIComponent]]:
+        """Retorna os itens cuja caixa contém o ponto (x, y)"""
+        found = []
+        node: Optional[_QuadTree] = self
+        while node is not None:
+            for item in node.items:
+                x0, y0, x1, y1 = item[1]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append(item)
+            if node.quadrants is None:
+                break
+            nx0, ny0, nx1, ny1 = node.bounds
+            mx, my = (nx0 + nx1) / 2, (ny0 + ny1) / 2
+            node = node.quadrants[(x >= mx) + 2 * (y >= my)]
+        return found
+
+
 # Sistema cliente que demonstra o uso do padrão
 class UIRenderer:
+    __slots__ = ("root_components", "_quadtree")
+
     def __init__(self):
         self.root_components: List[UIComponent] = []
+        self._quadtree: Optional[_QuadTree] = None
 
     def add_component(self, component: UIComponent) -> None:
         self.root_components.append(component)
+        component._parent = self
+        self._quadtree = None
+
+    def _child_bounds_changed(self) -> None:
+        self._quadtree = None
+
+    def _get_quadtree(self) -> _QuadTree:
+        """Reconstrói o índice apenas se componentes ou limites mudaram"""
+        if self._quadtree is None:
+            boxes = [component._bounds_cache for component in self.root_components]
+            tree = _QuadTree(
+                (
+                    min(box[0] for box in boxes),
+                    min(box[1] for box in boxes),
+                    max(box[2] for box in boxes),
+                    max(box[3] for box in boxes),
+                )
+            )
+            for order, (component, box) in enumerate(zip(self.root_components, boxes)):
+                tree.insert(order, box, component)
+            self._quadtree = tree
+        return self._quadtree
 
     def render_all(self) -> None:
         """Renderiza todos os componentes - trata folhas e composites uniformemente"""
-        print("=== Rendering UI ===")
+        out = ["=== Rendering UI ==="]
         for component in self.root_components:
-            component.render()
-            print()
+            component._render(out)
+            out.append("")
+        sys.stdout.write("\n".join(out) + "\n")
 
     def handle_global_click(self, x: int, y: int) -> None:
         """Processa clique global - propaga para todos os componentes"""
         print(f"\n=== Processing click at ({x}, {y}) ===")
         handled = False
 
-        for component in reversed(
-            self.root_components
-        ):  # Z-order: último renderizado primeiro
+        # Só os componentes cujos limites contêm o ponto podem tratar o clique
+        candidates = self._get_quadtree().query(x, y) if self.root_components else []
+        candidates.sort(reverse=True)  # Z-order: último renderizado primeiro
+
+        for _, _, component in candidates:
             if component.handle_click(x, y):
                 handled = True
                 break
@@ -314,10 +636,13 @@ class UIRenderer:
             print("Click not handled by any component")
 
     def count_components(self, component: UIComponent) -> int:
-        """Conta total de componentes recursivamente"""
-        count = 1  # O próprio componente
-        for child in component.get_children():
-            count += self.count_components(child)
+        """Conta total de componentes da subárvore usando uma pilha explícita"""
+        stack = [component]
+        count = 0
+        while stack:
+            current = stack.pop()
+            count += 1
+            stack.extend(_iter_children(current))
         return count
 
     def get_total_components(self) -> int:
@@ -346,12 +671,10 @@ def main():
 
     # Adicionando campos ao formulário
     name_label = Label(20, 140, 100, 25, "Name:")
-    name_field = TextField(130, 140, 200, 25, "Enter your name")
-    name_field.name = "name"  # Para validação
+    name_field = TextField(130, 140, 200, 25, "Enter your name", name="name")
 
     email_label = Label(20, 180, 100, 25, "Email:")
-    email_field = TextField(130, 180, 200, 25, "Enter your email")
-    email_field.name = "email"
+    email_field = TextField(130, 180, 200, 25, "Enter your email", name="email")
 
     # Adicionando componentes ao formulário
     form.add(name_label)
@@ -1,10 +1,34 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+
+def _memoized(method: Callable[[Any], T]) -> Callable[[Any], T]:
+    """Guarda no objeto o resultado do método; bebidas não mudam após criadas"""
+    attr = f"_cached_{method.__name__}"
+
+    @wraps(method)
+    def wrapper(self) -> T:
+        try:
+            return getattr(self, attr)
+        except AttributeError:
+            value = method(self)
+            setattr(self, attr, value)
+            return value
+
+    return wrapper
 
 
 # Component - Interface comum para bebidas
 class Beverage(ABC):
+    # As subclasses guardam seus campos em slots privados expostos como
+    # propriedades somente leitura: os valores memoizados dependem deles
+    __slots__ = ("_cached_get_description", "_cached_get_cost")
+
     @abstractmethod
     def get_description(self) -> str:
         """Retorna a descrição da bebida"""
@@ -31,166 +55,282 @@ class MilkType(Enum):
     OAT = "oat milk"
 
 
+_PREMIUM_FLAVORS = frozenset({"hazelnut", "caramel", "Irish cream"})
+_CINNAMON_COSTS = MappingProxyType({"light": 0.15, "regular": 0.25, "extra": 0.35})
+
+
 # Concrete Components - Bebidas base
 class Coffee(Beverage):
+    __slots__ = ("_size",)
+
+    _BASE_COSTS = MappingProxyType(
+        {Size.SMALL: 2.50, Size.MEDIUM: 3.00, Size.LARGE: 3.50}
+    )
+
     def __init__(self, size: Size = Size.MEDIUM):
-        self.size = size
-        self._base_costs = {Size.SMALL: 2.50, Size.MEDIUM: 3.00, Size.LARGE: 3.50}
+        self._size = size
+
+    @property
+    def size(self) -> Size:
+        return self._size
 
+    @_memoized
     def get_description(self) -> str:
-        return f"{self.size.value.title()} Coffee"
+        return f"{self._size.value.title()} Coffee"
 
+    @_memoized
     def get_cost(self) -> float:
-        return self._base_costs[self.size]
+        return self._BASE_COSTS[self._size]
 
 
 class Tea(Beverage):
+    __slots__ = ("_tea_type", "_size")
+
+    _BASE_COSTS = MappingProxyType(
+        {Size.SMALL: 2.00, Size.MEDIUM: 2.50, Size.LARGE: 3.00}
+    )
+
     def __init__(self, tea_type: str = "Earl Grey", size: Size = Size.MEDIUM):
-        self.tea_type = tea_type
-        self.size = size
-        self._base_costs = {Size.SMALL: 2.00, Size.MEDIUM: 2.50, Size.LARGE: 3.00}
+        self._tea_type = tea_type
+        self._size = size
 
+    @property
+    def tea_type(self) -> str:
+        return self._tea_type
+
+    @property
+    def size(self) -> Size:
+        return self._size
+
+    @_memoized
     def get_description(self) -> str:
-        return f"{self.size.value.title()} {self.tea_type} Tea"
+        return f"{self._size.value.title()} {self._tea_type} Tea"
 
+    @_memoized
     def get_cost(self) -> float:
-        return self._base_costs[self.size]
+        return self._BASE_COSTS[self._size]
 
 
 class HotChocolate(Beverage):
+    __slots__ = ("_size", "_cocoa_percentage")
+
+    _BASE_COSTS = MappingProxyType(
+        {Size.SMALL: 3.00, Size.MEDIUM: 3.75, Size.LARGE: 4.50}
+    )
+
     def __init__(self, size: Size = Size.MEDIUM, cocoa_percentage: int = 70):
-        self.size = size
-        self.cocoa_percentage = cocoa_percentage
-        self._base_costs = {Size.SMALL: 3.00, Size.MEDIUM: 3.75, Size.LARGE: 4.50}
+        self._size = size
+        self._cocoa_percentage = cocoa_percentage
+
+    @property
+    def size(self) -> Size:
+        return self._size
+
+    @property
+    def cocoa_percentage(self) -> int:
+        return self._cocoa_percentage
 
+    @_memoized
     def get_description(self) -> str:
         return (
-            f"{self.size.value.title()} Hot Chocolate ({self.cocoa_percentage}% cocoa)"
+            f"{self._size.value.title()} Hot Chocolate "
+            f"({self._cocoa_percentage}% cocoa)"
         )
 
+    @_memoized
     def get_cost(self) -> float:
-        base_cost = self._base_costs[self.size]
+        base_cost = self._BASE_COSTS[self._size]
         # Chocolate premium (>85%) custa mais
-        if self.cocoa_percentage > 85:
+        if self._cocoa_percentage > 85:
             base_cost += 0.50
         return base_cost
 
 
 # Base Decorator
 class BeverageDecorator(Beverage):
+    __slots__ = ("_beverage",)
+
     def __init__(self, beverage: Beverage):
-        self.beverage = beverage
+        self._beverage = beverage
 
-    @abstractmethod
-    def get_description(self) -> str:
-        pass
+    @property
+    def beverage(self) -> Beverage:
+        return self._beverage
 
-    @abstractmethod
+    @_memoized
+    def get_description(self) -> str:
+        return ", ".join(self._desc_fragments())
+
+    def _desc_fragments(self) -> List[str]:
+        """Partes da descrição, unidas por ", " em get_description"""
+        # Coleta os trechos descendo a cadeia; um elo que sobrescreve
+        # get_description() entra com a própria descrição e encerra a descida
+        fragments = [self._description_suffix()]
+        node = self._beverage
+        while (
+            isinstance(node, BeverageDecorator)
+            and type(node).get_description is _CHAINED_DESCRIPTION
+        ):
+            fragments.append(node._description_suffix())
+            node = node._beverage
+        fragments.append(node.get_description())
+        fragments.reverse()
+        return [fragment for fragment in fragments if fragment]
+
+    @_memoized
     def get_cost(self) -> float:
-        pass
+        return self._beverage.get_cost() + self._extra_cost()
+
+    def _description_suffix(self) -> str:
+        """Trecho que o complemento acrescenta à descrição"""
+        return ""
+
+    def _extra_cost(self) -> float:
+        """Valor que o complemento acrescenta ao custo"""
+        return 0.0
+
+
+_CHAINED_DESCRIPTION = BeverageDecorator.get_description
 
 
 # Concrete Decorators - Complementos específicos
 class MilkDecorator(BeverageDecorator):
-    def __init__(self, beverage: Beverage, milk_type: MilkType = MilkType.WHOLE):
-        super().__init__(beverage)
-        self.milk_type = milk_type
-        self._milk_costs = {
+    __slots__ = ("_milk_type",)
+
+    _MILK_COSTS = MappingProxyType(
+        {
             MilkType.WHOLE: 0.30,
             MilkType.SKIM: 0.30,
             MilkType.ALMOND: 0.60,
             MilkType.SOY: 0.55,
             MilkType.OAT: 0.65,
         }
+    )
 
-    def get_description(self) -> str:
-        return f"{self.beverage.get_description()}, {self.milk_type.value}"
+    def __init__(self, beverage: Beverage, milk_type: MilkType = MilkType.WHOLE):
+        super().__init__(beverage)
+        self._milk_type = milk_type
 
-    def get_cost(self) -> float:
-        return self.beverage.get_cost() + self._milk_costs[self.milk_type]
+    @property
+    def milk_type(self) -> MilkType:
+        return self._milk_type
+
+    def _description_suffix(self) -> str:
+        return self._milk_type.value
+
+    def _extra_cost(self) -> float:
+        return self._MILK_COSTS[self._milk_type]
 
 
 class SugarDecorator(BeverageDecorator):
+    __slots__ = ("_sugar_packets",)
+
     def __init__(self, beverage: Beverage, sugar_packets: int = 1):
         super().__init__(beverage)
-        self.sugar_packets = sugar_packets
+        self._sugar_packets = sugar_packets
 
-    def get_description(self) -> str:
-        if self.sugar_packets == 1:
-            return f"{self.beverage.get_description()}, sugar"
+    @property
+    def sugar_packets(self) -> int:
+        return self._sugar_packets
+
+    def _description_suffix(self) -> str:
+        if self._sugar_packets == 1:
+            return "sugar"
         else:
-            return f"{self.beverage.get_description()}, {self.sugar_packets} sugars"
+            return f"{self._sugar_packets} sugars"
 
-    def get_cost(self) -> float:
-        return self.beverage.get_cost() + (0.10 * self.sugar_packets)
+    def _extra_cost(self) -> float:
+        return 0.10 * self._sugar_packets
 
 
 class WhippedCreamDecorator(BeverageDecorator):
+    __slots__ = ("_extra_portion",)
+
     def __init__(self, beverage: Beverage, extra_portion: bool = False):
         super().__init__(beverage)
-        self.extra_portion = extra_portion
+        self._extra_portion = extra_portion
 
-    def get_description(self) -> str:
-        if self.extra_portion:
-            return f"{self.beverage.get_description()}, extra whipped cream"
+    @property
+    def extra_portion(self) -> bool:
+        return self._extra_portion
+
+    def _description_suffix(self) -> str:
+        if self._extra_portion:
+            return "extra whipped cream"
         else:
-            return f"{self.beverage.get_description()}, whipped cream"
+            return "whipped cream"
 
-    def get_cost(self) -> float:
+    def _extra_cost(self) -> float:
         base_cost = 0.70
-        if self.extra_portion:
+        if self._extra_portion:
             base_cost += 0.30
-        return self.beverage.get_cost() + base_cost
+        return base_cost
 
 
 class SyrupDecorator(BeverageDecorator):
+    __slots__ = ("_syrup_flavor", "_pumps", "_cost_per_pump")
+
     def __init__(
         self, beverage: Beverage, syrup_flavor: str = "vanilla", pumps: int = 1
     ):
         super().__init__(beverage)
-        self.syrup_flavor = syrup_flavor
-        self.pumps = pumps
-        self._premium_flavors = {"hazelnut", "caramel", "Irish cream"}
+        self._syrup_flavor = syrup_flavor
+        self._pumps = pumps
+        self._cost_per_pump = 0.60 if syrup_flavor.lower() in _PREMIUM_FLAVORS else 0.40
 
-    def get_description(self) -> str:
-        pump_text = "pump" if self.pumps == 1 else "pumps"
-        return f"{self.beverage.get_description()}, {self.pumps} {pump_text} of {self.syrup_flavor} syrup"
+    @property
+    def syrup_flavor(self) -> str:
+        return self._syrup_flavor
 
-    def get_cost(self) -> float:
-        cost_per_pump = 0.40
-        if self.syrup_flavor.lower() in self._premium_flavors:
-            cost_per_pump = 0.60
-        return self.beverage.get_cost() + (cost_per_pump * self.pumps)
+    @property
+    def pumps(self) -> int:
+        return self._pumps
+
+    def _description_suffix(self) -> str:
+        pump_text = "pump" if self._pumps == 1 else "pumps"
+        return f"{self._pumps} {pump_text} of {self._syrup_flavor} syrup"
+
+    def _extra_cost(self) -> float:
+        return self._cost_per_pump * self._pumps
 
 
 class CinnamonDecorator(BeverageDecorator):
+    __slots__ = ("_amount",)
+
     def __init__(self, beverage: Beverage, amount: str = "light"):
         super().__init__(beverage)
-        self.amount = amount  # light, regular, extra
+        self._amount = amount  # light, regular, extra
 
-    def get_description(self) -> str:
-        if self.amount == "regular":
-            return f"{self.beverage.get_description()}, cinnamon"
+    @property
+    def amount(self) -> str:
+        return self._amount
+
+    def _description_suffix(self) -> str:
+        if self._amount == "regular":
+            return "cinnamon"
         else:
-            return f"{self.beverage.get_description()}, {self.amount} cinnamon"
+            return f"{self._amount} cinnamon"
 
-    def get_cost(self) -> float:
-        cost_map = {"light": 0.15, "regular": 0.25, "extra": 0.35}
-        return self.beverage.get_cost() + cost_map.get(self.amount, 0.25)
+    def _extra_cost(self) -> float:
+        return _CINNAMON_COSTS.get(self._amount, 0.25)
 
 
 class HoneyDecorator(BeverageDecorator):
+    __slots__ = ("_organic",)
+
     def __init__(self, beverage: Beverage, organic: bool = False):
         super().__init__(beverage)
-        self.organic = organic
+        self._organic = organic
 
-    def get_description(self) -> str:
-        honey_type = "organic honey" if self.organic else "honey"
-        return f"{self.beverage.get_description()}, {honey_type}"
+    @property
+    def organic(self) -> bool:
+        return self._organic
 
-    def get_cost(self) -> float:
-        cost = 0.50 if self.organic else 0.30
-        return self.beverage.get_cost() + cost
+    def _description_suffix(self) -> str:
+        return "organic honey" if self._organic else "honey"
+
+    def _extra_cost(self) -> float:
+        return 0.50 if self._organic else 0.30
 
 
 # Sistema de pedidos que utiliza os decorators
@@ -198,31 +338,31 @@ class BeverageBuilder:
     def __init__(self, base_beverage: Beverage):
         self.beverage = base_beverage
 
-    def add_milk(self, milk_type: MilkType = MilkType.WHOLE) -> "BeverageBuilder":
-        self.beverage = MilkDecorator(self.beverage, milk_type)
+    def _add(self, decorator: BeverageDecorator) -> "BeverageBuilder":
+        self.beverage = decorator
         return self
 
+    def add_milk(self, milk_type: MilkType = MilkType.WHOLE) -> "BeverageBuilder":
+        return self._add(MilkDecorator(self.beverage, milk_type))
+
     def add_sugar(self, packets: int = 1) -> "BeverageBuilder":
-        self.beverage = SugarDecorator(self.beverage, packets)
-        return self
+        return self._add(SugarDecorator(self.beverage, packets))
 
     def add_whipped_cream(self, extra: bool = False) -> "BeverageBuilder":
-        self.beverage = WhippedCreamDecorator(self.beverage, extra)
-        return self
+        return self._add(WhippedCreamDecorator(self.beverage, extra))
 
     def add_syrup(self, flavor: str = "vanilla", pumps: int = 1) -> "BeverageBuilder":
-        self.beverage = SyrupDecorator(self.beverage, flavor, pumps)
-        return self
+        return self._add(SyrupDecorator(self.beverage, flavor, pumps))
 
     def add_cinnamon(self, amount: str = "regular") -> "BeverageBuilder":
-        self.beverage = CinnamonDecorator(self.beverage, amount)
-        return self
+        return self._add(CinnamonDecorator(self.beverage, amount))
 
     def add_honey(self, organic: bool = False) -> "BeverageBuilder":
-        self.beverage = HoneyDecorator(self.beverage, organic)
-        return self
+        return self._add(HoneyDecorator(self.beverage, organic))
 
     def build(self) -> Beverage:
+        # Devolve a cadeia montada; custo e descrição são memoizados em cada elo,
+        # então cada consulta após a primeira é uma leitura de atributo
         return self.beverage
 
 
@@ -1,12 +1,26 @@
-import uuid
-from dataclasses import dataclass
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from enum import IntEnum
+from operator import mul
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def _new_id() -> str:
+    # 128 bits aleatórios em hex, sem o custo de montar um uuid.UUID
+    return os.urandom(16).hex()
 
 
 # Data classes para estruturar informações
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Product:
     id: str
     name: str
@@ -16,14 +30,19 @@ class Product:
     weight: float
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderItem:
     product_id: str
     quantity: int
     unit_price: float
 
+    def __post_init__(self):
+        # Só str pode ser internada; outros tipos seguem para a validação do pedido
+        if isinstance(self.product_id, str):
+            self.product_id = sys.intern(self.product_id)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class PaymentInfo:
     card_number: str
     expiry_date: str
@@ -32,7 +51,7 @@ class PaymentInfo:
     billing_address: Dict[str, str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Address:
     street: str
     city: str
@@ -40,8 +59,12 @@ class Address:
     zip_code: str
     country: str
 
+    def __post_init__(self):
+        if isinstance(self.state, str):
+            object.__setattr__(self, "state", sys.intern(self.state))
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrderResult:
     success: bool
     order_id: Optional[str]
@@ -51,13 +74,72 @@ class OrderResult:
     error_message: Optional[str] = None
 
 
-class OrderStatus(Enum):
-    PENDING = "pending"
-    CONFIRMED = "confirmed"
-    PROCESSING = "processing"
-    SHIPPED = "shipped"
-    DELIVERED = "delivered"
-    CANCELLED = "cancelled"
+# Payload JSON pré-montado por tipo: só os campos variáveis são interpolados
+_NOTIFICATION_TEMPLATES = {
+    "order_confirmation": (
+        '{{"type":"order_confirmation","customer_id":{cid},"order_id":{ref},'
+        '"ts":"{ts}"}}'
+    ),
+    "payment_confirmation": (
+        '{{"type":"payment_confirmation","customer_id":{cid},"transaction_id":{ref},'
+        '"ts":"{ts}"}}'
+    ),
+    "shipping_notification": (
+        '{{"type":"shipping_notification","customer_id":{cid},'
+        '"tracking_number":{ref},"ts":"{ts}"}}'
+    ),
+}
+
+
+@dataclass(slots=True)
+class Notification:
+    type: str
+    customer_id: str
+    ref: Optional[str]
+    timestamp: datetime
+
+    def to_json(self) -> str:
+        return _NOTIFICATION_TEMPLATES[self.type].format(
+            cid=json.dumps(self.customer_id),
+            ref=json.dumps(self.ref),
+            ts=self.timestamp.isoformat(),
+        )
+
+
+@dataclass(slots=True)
+class AuditLog:
+    type: str
+    ref: str
+    event_type: str
+    timestamp: datetime
+    details: Optional[Dict[str, Any]] = None
+
+
+_ERR_TEMPLATE = OrderResult(
+    success=False,
+    order_id=None,
+    total_amount=0.0,
+    estimated_delivery=None,
+    tracking_number=None,
+    error_message="",
+)
+
+
+def _err(message: Optional[str], total_amount: float = 0.0) -> OrderResult:
+    return replace(_ERR_TEMPLATE, error_message=message, total_amount=total_amount)
+
+
+class OrderStatus(IntEnum):
+    PENDING = 0
+    CONFIRMED = 1
+    PROCESSING = 2
+    SHIPPED = 3
+    DELIVERED = 4
+    CANCELLED = 5
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
 
 
 # Subsistemas complexos (simulados)
@@ -98,20 +180,26 @@ class ProductCatalogService:
                 0.3,
             ),
         }
+        self.products = {sys.intern(k): v for k, v in self.products.items()}
 
     def get_product(self, product_id: str) -> Optional[Product]:
-        print(f"CatalogService: Fetching product {product_id}")
+        log.debug("CatalogService: Fetching product %s", product_id)
         return self.products.get(product_id)
 
     def validate_product_exists(self, product_id: str) -> bool:
         exists = product_id in self.products
-        print(f"CatalogService: Product {product_id} exists: {exists}")
+        log.debug("CatalogService: Product %s exists: %s", product_id, exists)
         return exists
 
+    def get_products_bulk(self, ids: List[str]) -> Dict[str, Product]:
+        log.debug("CatalogService: Fetching %s products in bulk", len(ids))
+        products = self.products
+        return {i: products[i] for i in ids if i in products}
+
     def get_product_price(self, product_id: str) -> float:
         product = self.products.get(product_id)
         if product:
-            print(f"CatalogService: Price for {product_id}: ${product.price}")
+            log.debug("CatalogService: Price for %s: $%s", product_id, product.price)
             return product.price
         return 0.0
 
@@ -125,45 +213,76 @@ class InventoryService:
             "BOOK001": 100,
             "SHIRT001": 25,
         }
+        self.stock_levels = {sys.intern(k): v for k, v in self.stock_levels.items()}
         self.reservations = {}
+        self.by_order: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
 
     def check_availability(self, product_id: str, quantity: int) -> bool:
         available = self.stock_levels.get(product_id, 0)
         is_available = available >= quantity
-        print(
-            f"InventoryService: {product_id} availability check - needed: {quantity}, available: {available}, result: {is_available}"
+        log.debug(
+            "InventoryService: %s availability check - needed: %s, available: %s, result: %s",
+            product_id,
+            quantity,
+            available,
+            is_available,
         )
         return is_available
 
-    def reserve_items(self, product_id: str, quantity: int, order_id: str) -> bool:
-        if self.check_availability(product_id, quantity):
-            reservation_id = str(uuid.uuid4())
+    def availability(self, product_id: str, quantity: int) -> Tuple[bool, bool]:
+        """Retorna (existe, suficiente) com uma única consulta ao estoque"""
+        stock = self.stock_levels.get(product_id)
+        return stock is not None, stock is not None and stock >= quantity
+
+    def get_stock_map(self, ids: List[str]) -> Dict[str, int]:
+        stock_levels = self.stock_levels
+        return {i: stock_levels.get(i, 0) for i in ids}
+
+    def reserve_items(
+        self,
+        product_id: str,
+        quantity: int,
+        order_id: str,
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        # Leitura e baixa do estoque numa única seção crítica (evita overselling)
+        with self._lock:
+            current = self.stock_levels.get(product_id, 0)
+            if current < quantity:
+                log.debug(
+                    "InventoryService: Failed to reserve %s units of %s - insufficient stock",
+                    quantity,
+                    product_id,
+                )
+                return False
+            self.stock_levels[product_id] = current - quantity
+            reservation_id = _new_id()
             self.reservations[reservation_id] = {
                 "product_id": product_id,
                 "quantity": quantity,
                 "order_id": order_id,
-                "timestamp": datetime.now(),
+                "timestamp": timestamp or datetime.now(),
             }
-            self.stock_levels[product_id] -= quantity
-            print(
-                f"InventoryService: Reserved {quantity} units of {product_id} for order {order_id}"
-            )
-            return True
-        print(
-            f"InventoryService: Failed to reserve {quantity} units of {product_id} - insufficient stock"
+            self.by_order[order_id].append(reservation_id)
+        log.debug(
+            "InventoryService: Reserved %s units of %s for order %s",
+            quantity,
+            product_id,
+            order_id,
         )
-        return False
+        return True
 
     def release_reservation(self, order_id: str) -> bool:
-        for res_id, reservation in self.reservations.items():
-            if reservation["order_id"] == order_id:
-                product_id = reservation["product_id"]
-                quantity = reservation["quantity"]
-                self.stock_levels[product_id] += quantity
-                del self.reservations[res_id]
-                print(f"InventoryService: Released reservation for order {order_id}")
-                return True
-        return False
+        with self._lock:
+            reservation_ids = self.by_order.pop(order_id, None)
+            if not reservation_ids:
+                return False
+            for res_id in reservation_ids:
+                reservation = self.reservations.pop(res_id)
+                self.stock_levels[reservation["product_id"]] += reservation["quantity"]
+        log.debug("InventoryService: Released reservation for order %s", order_id)
+        return True
 
 
 class PaymentService:
@@ -177,44 +296,69 @@ class PaymentService:
             and len(payment_info.cvv) == 3
             and payment_info.cardholder_name.strip() != ""
         )
-        print(f"PaymentService: Payment info validation result: {is_valid}")
+        log.debug("PaymentService: Payment info validation result: %s", is_valid)
         return is_valid
 
     def process_payment(
-        self, amount: float, payment_info: PaymentInfo
+        self,
+        amount: float,
+        payment_info: PaymentInfo,
+        timestamp: Optional[datetime] = None,
     ) -> Dict[str, Any]:
-        print(f"PaymentService: Processing payment of ${amount:.2f}")
+        log.debug("PaymentService: Processing payment of $%.2f", amount)
 
         if not self.validate_payment_info(payment_info):
             return {"success": False, "error": "Invalid payment information"}
 
         # Simulação de processamento
         if payment_info.card_number.startswith("4111"):  # Simulação de cartão válido
-            transaction_id = str(uuid.uuid4())
+            transaction_id = _new_id()
             self.processed_payments[transaction_id] = {
                 "amount": amount,
-                "timestamp": datetime.now(),
+                "timestamp": timestamp or datetime.now(),
                 "status": "completed",
             }
-            print(
-                f"PaymentService: Payment successful - Transaction ID: {transaction_id}"
+            log.debug(
+                "PaymentService: Payment successful - Transaction ID: %s",
+                transaction_id,
             )
             return {"success": True, "transaction_id": transaction_id}
         else:
-            print("PaymentService: Payment failed - Card declined")
+            log.debug("PaymentService: Payment failed - Card declined")
             return {"success": False, "error": "Card declined"}
 
 
+_SURCHARGE_STATES = frozenset({"CA", "NY", "TX"})
+
+
 class ShippingService:
-    def __init__(self):
+    def __init__(self, catalog_service: Optional[ProductCatalogService] = None):
         self.shipments = {}
         self.shipping_rates = {"standard": 5.99, "express": 12.99, "overnight": 24.99}
+        self._catalog_service = catalog_service
+        self.refresh_weight_cache()
+
+    def refresh_weight_cache(self) -> None:
+        """Recarrega o snapshot de pesos; chamar após alterar o catálogo"""
+        catalog_service = self._catalog_service
+        self._weight_cache: Optional[Dict[str, float]] = (
+            {pid: p.weight for pid, p in catalog_service.products.items()}
+            if catalog_service is not None
+            else None
+        )
 
     def calculate_shipping_cost(
         self, items: List[OrderItem], address: Address
     ) -> float:
         # Simulação de cálculo baseado em peso e distância
-        total_weight = len(items) * 0.5  # Peso simulado
+        weight_cache = self._weight_cache
+        if weight_cache is None:
+            total_weight = len(items) * 0.5  # Peso simulado
+        else:
+            total_weight = sum(
+                weight_cache.get(item.product_id, 0.0) * item.quantity
+                for item in items
+            )
         base_cost = self.shipping_rates["standard"]
 
         # Ajuste por peso
@@ -222,17 +366,21 @@ class ShippingService:
             base_cost += (total_weight - 2.0) * 2.0
 
         # Ajuste por localização
-        if address.state in ["CA", "NY", "TX"]:
+        if address.state in _SURCHARGE_STATES:
             base_cost += 2.0
 
-        print(f"ShippingService: Calculated shipping cost: ${base_cost:.2f}")
+        log.debug("ShippingService: Calculated shipping cost: $%.2f", base_cost)
         return base_cost
 
     def create_shipment(
-        self, order_id: str, items: List[OrderItem], address: Address
+        self,
+        order_id: str,
+        items: List[OrderItem],
+        address: Address,
+        timestamp: Optional[datetime] = None,
     ) -> Dict[str, Any]:
-        tracking_number = f"TRK{uuid.uuid4().hex[:10].upper()}"
-        estimated_delivery = datetime.now() + timedelta(days=5)
+        tracking_number = f"TRK{os.urandom(5).hex().upper()}"
+        estimated_delivery = (timestamp or datetime.now()) + timedelta(days=5)
 
         shipment_info = {
             "tracking_number": tracking_number,
@@ -242,103 +390,261 @@ class ShippingService:
         }
 
         self.shipments[tracking_number] = shipment_info
-        print(
-            f"ShippingService: Created shipment {tracking_number} for order {order_id}"
+        log.debug(
+            "ShippingService: Created shipment %s for order %s",
+            tracking_number,
+            order_id,
         )
         return shipment_info
 
 
+# Notificações e auditoria saem do caminho crítico: uma thread consome a fila
+_event_q: "queue.Queue[Tuple[Callable[..., Any], Tuple[Any, ...]]]" = queue.Queue()
+
+
+def _drain() -> None:
+    while True:
+        func, args = _event_q.get()
+        try:
+            func(*args)
+        except Exception as e:
+            log.error("EventWorker: Failed to process event: %s", e)
+        finally:
+            _event_q.task_done()
+
+
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _start_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_drain, name="facade-events", daemon=True)
+            _worker.start()
+
+
+def _enqueue(func: Callable[..., Any], *args: Any) -> None:
+    # A thread só é criada no primeiro evento, não na importação do módulo
+    if _worker is None:
+        _start_worker()
+    _event_q.put((func, args))
+
+
+def wait_for_events() -> None:
+    """Bloqueia até que todos os eventos enfileirados tenham sido processados"""
+    _event_q.join()
+
+
 class NotificationService:
     def __init__(self):
-        self.sent_notifications = []
+        self.sent_notifications: List[Notification] = []
+        # Payloads JSON entregues ao barramento de mensagens (simulado)
+        self.outbox: List[str] = []
+
+    def _deliver(self, notifications: List[Notification]) -> None:
+        self.sent_notifications.extend(notifications)
+        self.outbox.extend(notification.to_json() for notification in notifications)
+
+    def _do_send_order_confirmation(
+        self, customer_id: str, order_info: Dict[str, Any]
+    ) -> bool:
+        self._deliver(
+            [
+                Notification(
+                    "order_confirmation",
+                    customer_id,
+                    order_info.get("order_id"),
+                    datetime.now(),
+                )
+            ]
+        )
+        log.debug(
+            "NotificationService: Sent order confirmation to customer %s", customer_id
+        )
+        return True
 
     def send_order_confirmation(
         self, customer_id: str, order_info: Dict[str, Any]
     ) -> bool:
-        notification = {
-            "type": "order_confirmation",
-            "customer_id": customer_id,
-            "order_id": order_info.get("order_id"),
-            "timestamp": datetime.now(),
-        }
-        self.sent_notifications.append(notification)
-        print(f"NotificationService: Sent order confirmation to customer {customer_id}")
+        _enqueue(self._do_send_order_confirmation, customer_id, order_info)
+        return True
+
+    def _do_send_shipping_notification(
+        self, customer_id: str, tracking_info: Dict[str, Any]
+    ) -> bool:
+        self._deliver(
+            [
+                Notification(
+                    "shipping_notification",
+                    customer_id,
+                    tracking_info.get("tracking_number"),
+                    datetime.now(),
+                )
+            ]
+        )
+        log.debug(
+            "NotificationService: Sent shipping notification to customer %s",
+            customer_id,
+        )
         return True
 
     def send_shipping_notification(
         self, customer_id: str, tracking_info: Dict[str, Any]
     ) -> bool:
-        notification = {
-            "type": "shipping_notification",
-            "customer_id": customer_id,
-            "tracking_number": tracking_info.get("tracking_number"),
-            "timestamp": datetime.now(),
-        }
-        self.sent_notifications.append(notification)
-        print(
-            f"NotificationService: Sent shipping notification to customer {customer_id}"
+        _enqueue(self._do_send_shipping_notification, customer_id, tracking_info)
+        return True
+
+    def _do_send_payment_notification(
+        self, customer_id: str, payment_info: Dict[str, Any]
+    ) -> bool:
+        self._deliver(
+            [
+                Notification(
+                    "payment_confirmation",
+                    customer_id,
+                    payment_info.get("transaction_id"),
+                    datetime.now(),
+                )
+            ]
+        )
+        log.debug(
+            "NotificationService: Sent payment confirmation to customer %s",
+            customer_id,
         )
         return True
 
     def send_payment_notification(
         self, customer_id: str, payment_info: Dict[str, Any]
     ) -> bool:
-        notification = {
-            "type": "payment_confirmation",
-            "customer_id": customer_id,
-            "transaction_id": payment_info.get("transaction_id"),
-            "timestamp": datetime.now(),
-        }
-        self.sent_notifications.append(notification)
-        print(
-            f"NotificationService: Sent payment confirmation to customer {customer_id}"
+        _enqueue(self._do_send_payment_notification, customer_id, payment_info)
+        return True
+
+    def _do_emit_bundle(
+        self,
+        customer_id: str,
+        events: List[Tuple[str, Optional[str]]],
+        timestamp: datetime,
+    ) -> bool:
+        self._deliver(
+            [Notification(kind, customer_id, ref, timestamp) for kind, ref in events]
+        )
+        log.debug(
+            "NotificationService: Sent %s notifications to customer %s",
+            len(events),
+            customer_id,
+        )
+        return True
+
+    def emit_bundle(
+        self,
+        customer_id: str,
+        events: List[Tuple[str, Optional[str]]],
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        _enqueue(
+            self._do_emit_bundle, customer_id, events, timestamp or datetime.now()
         )
         return True
 
 
 class AuditService:
     def __init__(self):
-        self.audit_logs = []
+        self.audit_logs: List[AuditLog] = []
+
+    def _do_log_order_event(
+        self, order_id: str, event_type: str, details: Dict[str, Any]
+    ) -> bool:
+        self.audit_logs.append(
+            AuditLog("order_event", order_id, event_type, datetime.now(), details)
+        )
+        log.debug("AuditService: Logged %s event for order %s", event_type, order_id)
+        return True
 
     def log_order_event(
         self, order_id: str, event_type: str, details: Dict[str, Any]
     ) -> bool:
-        log_entry = {
-            "timestamp": datetime.now(),
-            "type": "order_event",
-            "order_id": order_id,
-            "event_type": event_type,
-            "details": details,
-        }
-        self.audit_logs.append(log_entry)
-        print(f"AuditService: Logged {event_type} event for order {order_id}")
+        _enqueue(self._do_log_order_event, order_id, event_type, details)
+        return True
+
+    def _do_log_payment_event(self, transaction_id: str, event_type: str) -> bool:
+        self.audit_logs.append(
+            AuditLog("payment_event", transaction_id, event_type, datetime.now())
+        )
+        log.debug(
+            "AuditService: Logged %s payment event for transaction %s",
+            event_type,
+            transaction_id,
+        )
         return True
 
     def log_payment_event(self, transaction_id: str, event_type: str) -> bool:
-        log_entry = {
-            "timestamp": datetime.now(),
-            "type": "payment_event",
-            "transaction_id": transaction_id,
-            "event_type": event_type,
-        }
-        self.audit_logs.append(log_entry)
-        print(
-            f"AuditService: Logged {event_type} payment event for transaction {transaction_id}"
+        _enqueue(self._do_log_payment_event, transaction_id, event_type)
+        return True
+
+    def _do_log_bundle(
+        self,
+        entries: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+        timestamp: datetime,
+    ) -> bool:
+        self.audit_logs.extend(
+            AuditLog(kind, ref, event_type, timestamp, details)
+            for kind, ref, event_type, details in entries
         )
+        log.debug("AuditService: Logged %s events", len(entries))
+        return True
+
+    def log_bundle(
+        self,
+        entries: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        _enqueue(self._do_log_bundle, entries, timestamp or datetime.now())
         return True
 
 
 # FACADE - Interface simplificada que coordena todos os subsistemas
 class ECommerceFacade:
+    _instance: Optional["ECommerceFacade"] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "ECommerceFacade":
+        """Facade compartilhado: um único catálogo e estoque para todos os clientes"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                # Revalida sob o lock: outra thread pode ter criado a instância
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
     def __init__(self):
         self.catalog_service = ProductCatalogService()
         self.inventory_service = InventoryService()
         self.payment_service = PaymentService()
-        self.shipping_service = ShippingService()
+        self.shipping_service = ShippingService(self.catalog_service)
         self.notification_service = NotificationService()
         self.audit_service = AuditService()
 
         self.orders = {}
+        self.refresh_catalog_caches()
+
+    def refresh_catalog_caches(self) -> None:
+        """Recarrega os snapshots de preço e peso; chamar após alterar o catálogo"""
+        self._price_cache: Dict[str, float] = {
+            pid: p.price for pid, p in self.catalog_service.products.items()
+        }
+        self.shipping_service.refresh_weight_cache()
+
+    def _price_of(self, product_id: str) -> Optional[float]:
+        """Preço pelo snapshot; None se o produto não existe no catálogo"""
+        price = self._price_cache.get(product_id)
+        if price is None and product_id in self.catalog_service.products:
+            # Produto incluído no catálogo depois do snapshot: recarrega
+            self.refresh_catalog_caches()
+            price = self._price_cache.get(product_id)
+        return price
 
     def process_order(
         self,
@@ -353,118 +659,92 @@ class ECommerceFacade:
         """
         print(f"\n=== Processing Order for Customer {customer_id} ===")
 
-        order_id = str(uuid.uuid4())
+        order_id = _new_id()
+        now = datetime.now()
 
         try:
-            # 1. Validar produtos e calcular totais
-            print("Step 1: Validating products and calculating totals...")
-            total_amount = 0.0
-            for item in items:
-                if not self.catalog_service.validate_product_exists(item.product_id):
-                    return OrderResult(
-                        False,
-                        None,
-                        0.0,
-                        None,
-                        None,
-                        f"Product {item.product_id} not found",
-                    )
-
-                product_price = self.catalog_service.get_product_price(item.product_id)
-                item.unit_price = product_price
-                total_amount += product_price * item.quantity
-
-            # 2. Verificar disponibilidade no estoque
-            print("Step 2: Checking inventory availability...")
-            for item in items:
-                if not self.inventory_service.check_availability(
-                    item.product_id, item.quantity
-                ):
-                    return OrderResult(
-                        False,
-                        None,
-                        0.0,
-                        None,
-                        None,
-                        f"Insufficient stock for {item.product_id}",
-                    )
-
-            # 3. Calcular custos de envio
-            print("Step 3: Calculating shipping costs...")
+            # 1. Validar produtos, calcular totais e verificar estoque
+            print("Step 1: Validating products, totals and inventory...")
+            if len(items) == 1:
+                total_amount, error = self._price_single_item(items[0])
+            else:
+                total_amount, error = self._price_items(items)
+            if error is not None:
+                return _err(error)
+
+            # 2. Calcular custos de envio
+            print("Step 2: Calculating shipping costs...")
             shipping_cost = self.shipping_service.calculate_shipping_cost(
                 items, shipping_address
             )
             total_amount += shipping_cost
 
-            # 4. Processar pagamento
-            print("Step 4: Processing payment...")
+            # 3. Processar pagamento
+            print("Step 3: Processing payment...")
             payment_result = self.payment_service.process_payment(
-                total_amount, payment_info
+                total_amount, payment_info, now
             )
             if not payment_result["success"]:
-                return OrderResult(
-                    False, None, total_amount, None, None, payment_result.get("error")
-                )
+                return _err(payment_result.get("error"), total_amount)
 
-            # 5. Reservar itens no estoque
-            print("Step 5: Reserving inventory...")
+            # 4. Reservar itens no estoque
+            print("Step 4: Reserving inventory...")
             for item in items:
                 if not self.inventory_service.reserve_items(
-                    item.product_id, item.quantity, order_id
+                    item.product_id, item.quantity, order_id, now
                 ):
                     # Rollback do pagamento seria necessário em um sistema real
-                    return OrderResult(
-                        False,
-                        None,
-                        total_amount,
-                        None,
-                        None,
-                        "Failed to reserve inventory",
-                    )
+                    return _err("Failed to reserve inventory", total_amount)
 
-            # 6. Criar envio
-            print("Step 6: Creating shipment...")
+            # 5. Criar envio
+            print("Step 5: Creating shipment...")
             shipment_info = self.shipping_service.create_shipment(
-                order_id, items, shipping_address
+                order_id, items, shipping_address, now
             )
 
-            # 7. Enviar notificações
-            print("Step 7: Sending notifications...")
-            order_info = {
-                "order_id": order_id,
-                "total_amount": total_amount,
-                "items": items,
-            }
-            self.notification_service.send_order_confirmation(customer_id, order_info)
-            self.notification_service.send_payment_notification(
-                customer_id, payment_result
-            )
-            self.notification_service.send_shipping_notification(
-                customer_id, shipment_info
+            # 6. Enviar notificações
+            print("Step 6: Sending notifications...")
+            self.notification_service.emit_bundle(
+                customer_id,
+                [
+                    ("order_confirmation", order_id),
+                    ("payment_confirmation", payment_result.get("transaction_id")),
+                    ("shipping_notification", shipment_info.get("tracking_number")),
+                ],
+                now,
             )
 
-            # 8. Registrar auditoria
-            print("Step 8: Logging audit events...")
-            self.audit_service.log_order_event(
-                order_id,
-                "order_created",
-                {
-                    "customer_id": customer_id,
-                    "total_amount": total_amount,
-                    "item_count": len(items),
-                },
-            )
-            self.audit_service.log_payment_event(
-                payment_result["transaction_id"], "payment_processed"
+            # 7. Registrar auditoria
+            print("Step 7: Logging audit events...")
+            self.audit_service.log_bundle(
+                [
+                    (
+                        "order_event",
+                        order_id,
+                        "order_created",
+                        {
+                            "customer_id": customer_id,
+                            "total_amount": total_amount,
+                            "item_count": len(items),
+                        },
+                    ),
+                    (
+                        "payment_event",
+                        payment_result["transaction_id"],
+                        "payment_processed",
+                        None,
+                    ),
+                ],
+                now,
             )
 
-            # 9. Armazenar pedido
+            # 8. Armazenar pedido
             self.orders[order_id] = {
                 "customer_id": customer_id,
                 "items": items,
                 "total_amount": total_amount,
                 "status": OrderStatus.CONFIRMED,
-                "created_at": datetime.now(),
+                "created_at": now,
                 "tracking_number": shipment_info["tracking_number"],
             }
 
@@ -481,7 +761,33 @@ class ECommerceFacade:
         except Exception as e:
             print(f"Error processing order: {str(e)}")
             # Em um sistema real, aqui teria rollback completo
-            return OrderResult(False, None, 0.0, None, None, f"System error: {str(e)}")
+            return _err(f"System error: {str(e)}")
+
+    def _price_items(self, items: List[OrderItem]) -> Tuple[float, Optional[str]]:
+        ids = [item.product_id for item in items]
+        price_of = self._price_of
+        prices = [price_of(product_id) for product_id in ids]
+        for product_id, price in zip(ids, prices):
+            if price is None:
+                return 0.0, f"Product {product_id} not found"
+
+        stock = self.inventory_service.get_stock_map(ids)
+        for item, price in zip(items, prices):
+            if stock[item.product_id] < item.quantity:
+                return 0.0, f"Insufficient stock for {item.product_id}"
+            item.unit_price = price
+        return float(sum(item.unit_price * item.quantity for item in items)), None
+
+    def _price_single_item(self, item: OrderItem) -> Tuple[float, Optional[str]]:
+        # Caminho rápido para o carrinho de um item só ("comprar agora")
+        product_id = item.product_id
+        price = self._price_of(product_id)
+        if price is None:
+            return 0.0, f"Product {product_id} not found"
+        if self.inventory_service.stock_levels.get(product_id, 0) < item.quantity:
+            return 0.0, f"Insufficient stock for {product_id}"
+        item.unit_price = price
+        return price * item.quantity, None
 
     def get_product_details(self, product_id: str) -> Optional[Product]:
         """Método simplificado para obter detalhes de produto"""
@@ -489,18 +795,25 @@ class ECommerceFacade:
 
     def check_product_availability(self, product_id: str, quantity: int) -> bool:
         """Método simplificado para verificar disponibilidade"""
-        return self.catalog_service.validate_product_exists(
-            product_id
-        ) and self.inventory_service.check_availability(product_id, quantity)
+        if self._price_of(product_id) is None:
+            return False
+        _, sufficient = self.inventory_service.availability(product_id, quantity)
+        return sufficient
 
     def calculate_order_total(
         self, items: List[OrderItem], shipping_address: Address
     ) -> Dict[str, float]:
         """Método simplificado para calcular total do pedido"""
-        subtotal = 0.0
-        for item in items:
-            price = self.catalog_service.get_product_price(item.product_id)
-            subtotal += price * item.quantity
+        price_of = self._price_of
+        subtotal = float(
+            sum(
+                map(
+                    mul,
+                    [price_of(item.product_id) or 0.0 for item in items],
+                    [item.quantity for item in items],
+                )
+            )
+        )
 
         shipping_cost = self.shipping_service.calculate_shipping_cost(
             items, shipping_address
@@ -540,7 +853,7 @@ class Customer:
     def __init__(self, customer_id: str, name: str):
         self.customer_id = customer_id
         self.name = name
-        self.ecommerce = ECommerceFacade()
+        self.ecommerce = ECommerceFacade.instance()
 
     def place_order(
         self,
@@ -564,6 +877,8 @@ class Customer:
 
 # Exemplo de uso
 def main():
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Criando um cliente
     customer = Customer("CUST001", "John Doe")
 
@@ -610,7 +925,7 @@ def main():
     ]
 
     # Calculando total antes do pedido
-    ecommerce = ECommerceFacade()
+    ecommerce = ECommerceFacade.instance()
     order_total = ecommerce.calculate_order_total(order_items, shipping_address)
     print(f"\n=== Order Summary ===")
     print(f"Subtotal: ${order_total['subtotal']:.2f}")
@@ -619,6 +934,7 @@ def main():
 
     # Processando o pedido (toda a complexidade é escondida no Facade)
     result = customer.place_order(order_items, payment_info, shipping_address)
+    wait_for_events()
 
     if result.success:
         print(f"\nOrder placed successfully!")
@@ -630,13 +946,14 @@ def main():
         # Consultando status do pedido
         order_status = ecommerce.get_order_status(result.order_id)
         if order_status:
-            print(f"Order Status: {order_status['status'].value}")
+            print(f"Order Status: {order_status['status'].label}")
 
         # Demonstrando cancelamento
         print(f"\n=== Order Cancellation Test ===")
         cancel_success = ecommerce.cancel_order(
             result.order_id, "Customer changed mind"
         )
+        wait_for_events()
         print(f"Cancellation successful: {cancel_success}")
 
     else:
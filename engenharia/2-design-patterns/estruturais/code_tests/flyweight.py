@@ -1,37 +1,87 @@
+import functools
+import logging
+import sys
+import threading
 import weakref
+from array import array
+from collections import namedtuple
+from itertools import accumulate, repeat
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
 
 
 # Enums e estruturas de dados
-class TextStyle(Enum):
-    NORMAL = "normal"
-    BOLD = "bold"
-    ITALIC = "italic"
-    BOLD_ITALIC = "bold_italic"
-    UNDERLINE = "underline"
+class TextStyle(IntEnum):
+    NORMAL = 0
+    BOLD = 1
+    ITALIC = 2
+    BOLD_ITALIC = 3
+    UNDERLINE = 4
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     x: int
     y: int
     line: int
     column: int
 
-    def __hash__(self):
-        return hash((self.x, self.y, self.line, self.column))
-
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FontMetrics:
     width: float
     height: float
     baseline: float
 
 
+@functools.lru_cache(maxsize=256)
+def _compute_metrics(font: str, size: int) -> FontMetrics:
+    # Métricas dependem só da fonte e do tamanho, não de cor ou estilo
+    base_width = len(font) * 0.6  # Simulação simples
+    return FontMetrics(
+        width=size * base_width / 10,
+        height=size * 1.2,
+        baseline=size * 0.8,
+    )
+
+
+# (linha, coluna) empacotadas num único inteiro de 64 bits; a ordem dos inteiros
+# coincide com a ordem de leitura (linha, depois coluna)
+_COLUMN_BITS = 32
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+# Linhas acima disso estourariam o inteiro de 64 bits com sinal de array("q")
+_LINE_LIMIT = 1 << (63 - _COLUMN_BITS)
+
+
+def _pack_position(line: int, column: int) -> int:
+    # Fora do intervalo a coluna invadiria os bits da linha (ou o sinal),
+    # misturando posições e quebrando a ordem de leitura
+    if not (0 <= line < _LINE_LIMIT and 0 <= column <= _COLUMN_MASK):
+        raise ValueError(f"Position out of range: line {line}, column {column}")
+    return (line << _COLUMN_BITS) | column
+
+
+# Registro de um caractere renderizado (tupla: sem dict por glifo)
+Rendered = namedtuple(
+    "Rendered", "char x y line column font size color style screen_x screen_y"
+)
+
+
+def _apply_zoom(values: Iterable[float], zoom: float) -> array:
+    """Escala uma coluna de coordenadas inteira num único passe em C"""
+    if zoom == 1.0:
+        return array("d", values)
+    return array("d", map(float(zoom).__mul__, values))
+
+
 class RenderContext:
     def __init__(self, canvas_width: int = 800, canvas_height: int = 600):
         self.canvas_width = canvas_width
@@ -49,17 +99,56 @@ class RenderContext:
         style: TextStyle,
     ) -> None:
         # Simulação de renderização
-        render_info = {
-            "character": char,
-            "position": position,
-            "font": font,
-            "size": size,
-            "color": color,
-            "style": style.value,
-            "screen_x": position.x * self.zoom_level,
-            "screen_y": position.y * self.zoom_level,
-        }
-        self.rendered_characters.append(render_info)
+        x, y, zoom = position.x, position.y, self.zoom_level
+        self.rendered_characters.append(
+            Rendered(
+                char,
+                x,
+                y,
+                position.line,
+                position.column,
+                font,
+                size,
+                color,
+                style.label,
+                x * zoom,
+                y * zoom,
+            )
+        )
+
+    def draw_batch(
+        self,
+        glyphs: Iterable["Glyph"],
+        xs: Sequence[float],
+        ys: Sequence[float],
+        lines: Iterable[int],
+        columns: Iterable[int],
+    ) -> None:
+        """Renderiza colunas paralelas de caracteres de uma só vez"""
+        # Zoom aplicado coluna a coluna antes do laço; o global é lido uma vez
+        screen_xs = _apply_zoom(xs, self.zoom_level)
+        screen_ys = _apply_zoom(ys, self.zoom_level)
+        rendered = Rendered
+        self.rendered_characters.extend(
+            [
+                rendered(
+                    glyph.char,
+                    x,
+                    y,
+                    line,
+                    column,
+                    glyph.flyweight.font,
+                    glyph.flyweight.size,
+                    glyph.flyweight.color,
+                    glyph.flyweight.style.label,
+                    screen_x,
+                    screen_y,
+                )
+                for glyph, x, y, line, column, screen_x, screen_y in zip(
+                    glyphs, xs, ys, lines, columns, screen_xs, screen_ys
+                )
+            ]
+        )
 
     def clear(self) -> None:
         self.rendered_characters.clear()
@@ -70,6 +159,8 @@ class RenderContext:
 
 # Flyweight interface
 class Character(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def render(self, position: Position, char: str, context: RenderContext) -> None:
         pass
@@ -77,15 +168,25 @@ class Character(ABC):
 
 # Concrete Flyweight - armazena estado intrínseco (formatação)
 class ConcreteCharacter(Character):
+    __slots__ = (
+        "font",
+        "size",
+        "color",
+        "style",
+        "_key",
+        "_hash",
+        "__weakref__",
+    )
+
     def __init__(self, font: str, size: int, color: str, style: TextStyle):
         # Estado intrínseco - compartilhado entre muitos caracteres
-        self.font = font
+        self.font = sys.intern(font)
         self.size = size
-        self.color = color
+        self.color = sys.intern(color)
         self.style = style
-
-        # Cache de métricas da fonte
-        self._font_metrics = None
+        # Chave e hash calculados uma vez: o estado intrínseco nunca muda
+        self._key = (self.font, size, self.color, style)
+        self._hash = hash(self._key)
 
     def render(self, position: Position, char: str, context: RenderContext) -> None:
         """
@@ -97,48 +198,67 @@ class ConcreteCharacter(Character):
 
     def get_font_metrics(self) -> FontMetrics:
         """Cache de métricas da fonte para evitar recálculos"""
-        if self._font_metrics is None:
-            # Simulação de cálculo de métricas baseado na fonte e tamanho
-            base_width = len(self.font) * 0.6  # Simulação simples
-            self._font_metrics = FontMetrics(
-                width=self.size * base_width / 10,
-                height=self.size * 1.2,
-                baseline=self.size * 0.8,
-            )
-        return self._font_metrics
+        return _compute_metrics(self.font, self.size)
 
     def is_same_format(
         self, font: str, size: int, color: str, style: TextStyle
     ) -> bool:
         """Verifica se este flyweight tem a mesma formatação"""
-        return (
-            self.font == font
-            and self.size == size
-            and self.color == color
-            and self.style == style
-        )
+        return self._key == (font, size, color, style)
 
     def __str__(self) -> str:
-        return f"CharacterFormat({self.font}, {self.size}pt, {self.color}, {self.style.value})"
+        return f"CharacterFormat({self.font}, {self.size}pt, {self.color}, {self.style.label})"
 
     def __hash__(self) -> int:
-        return hash((self.font, self.size, self.color, self.style))
+        return self._hash
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, ConcreteCharacter):
             return False
-        return (
-            self.font == other.font
-            and self.size == other.size
-            and self.color == other.color
-            and self.style == other.style
-        )
+        if self._hash != other._hash:
+            return False
+        return self._key == other._key
 
 
 # Flyweight Factory - gerencia e compartilha flyweights
 class CharacterFactory:
+    # Flyweights compartilhados por todas as factories do processo. Cada thread
+    # consulta antes o seu próprio cache, sem lock; só a promoção para o
+    # registro global é sincronizada
+    _shared: "weakref.WeakValueDictionary[Tuple, ConcreteCharacter]" = (
+        weakref.WeakValueDictionary()
+    )
+    _shared_lock = threading.Lock()
+    _local = threading.local()
+
+    @classmethod
+    def _acquire_shared(cls, key: Tuple) -> Tuple[ConcreteCharacter, bool]:
+        """Retorna (flyweight, criado) a partir do cache da thread ou global"""
+        local = getattr(cls._local, "flyweights", None)
+        if local is None:
+            local = cls._local.flyweights = weakref.WeakValueDictionary()
+        flyweight = local.get(key)
+        if flyweight is not None:
+            return flyweight, False
+
+        with cls._shared_lock:
+            flyweight = cls._shared.get(key)
+            created = flyweight is None
+            if created:
+                flyweight = cls._shared[key] = ConcreteCharacter(*key)
+        local[key] = flyweight
+        return flyweight, created
+
+    @classmethod
+    def get_shared_flyweight_count(cls) -> int:
+        """Número de flyweights vivos compartilhados entre documentos"""
+        return len(cls._shared)
+
     def __init__(self):
-        self._flyweights: Dict[Tuple, ConcreteCharacter] = {}
+        # Referências fracas: flyweights sem nenhum caractere usando são liberados
+        self._flyweights: "weakref.WeakValueDictionary[Tuple, ConcreteCharacter]" = (
+            weakref.WeakValueDictionary()
+        )
         self._total_requests = 0
         self._cache_hits = 0
 
@@ -149,16 +269,32 @@ class CharacterFactory:
         Retorna um flyweight compartilhado ou cria um novo se necessário
         """
         self._total_requests += 1
+        font = sys.intern(font)
+        color = sys.intern(color)
         key = (font, size, color, style)
 
-        if key not in self._flyweights:
-            # Cria novo flyweight apenas se não existir
-            self._flyweights[key] = ConcreteCharacter(font, size, color, style)
-            print(f"Created new flyweight: {font} {size}pt {color} {style.value}")
+        flyweight = self._flyweights.get(key)
+        if flyweight is None:
+            # Cria novo flyweight apenas se nenhum documento já o tiver criado
+            flyweight, created = self._acquire_shared(key)
+            self._flyweights[key] = flyweight
+            if created and log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "Created new flyweight: %s %spt %s %s",
+                    font,
+                    size,
+                    color,
+                    style.label,
+                )
         else:
             self._cache_hits += 1
 
-        return self._flyweights[key]
+        return flyweight
+
+    def record_hits(self, count: int) -> None:
+        """Contabiliza solicitações atendidas por um flyweight já obtido"""
+        self._total_requests += count
+        self._cache_hits += count
 
     def get_flyweight_count(self) -> int:
         """Retorna número de flyweights únicos criados"""
@@ -193,6 +329,8 @@ class CharacterFactory:
 
 # Context - armazena estado extrínseco e referência ao flyweight
 class DocumentCharacter:
+    __slots__ = ("_flyweight", "_position", "_character")
+
     def __init__(
         self, flyweight: ConcreteCharacter, position: Position, character: str
     ):
@@ -201,8 +339,11 @@ class DocumentCharacter:
         self._character = character  # Estado extrínseco - caractere específico
 
     def render(self, context: RenderContext) -> None:
-        """Delega renderização ao flyweight, passando estado extrínseco"""
-        self._flyweight.render(self._position, self._character, context)
+        """Desenha direto com o estado intrínseco do flyweight e o extrínseco local"""
+        fw = self._flyweight
+        context.draw_character(
+            self._character, self._position, fw.font, fw.size, fw.color, fw.style
+        )
 
     def get_position(self) -> Position:
         return self._position
@@ -225,13 +366,70 @@ class DocumentCharacter:
         return f"'{self._character}' at {self._position} using {self._flyweight}"
 
 
+# Par (flyweight, caractere) sem posição: repete-se muito num documento e por
+# isso é memoizado e compartilhado entre todas as posições que o usam
+class Glyph:
+    __slots__ = ("flyweight", "char", "__weakref__")
+
+    def __init__(self, flyweight: ConcreteCharacter, char: str):
+        self.flyweight = flyweight
+        self.char = char
+
+
 # Client - usa flyweights através da factory
 class TextDocument:
     def __init__(self, name: str):
         self.name = name
-        self._characters: List[DocumentCharacter] = []
+        # Estado extrínseco em colunas paralelas (SoA): um array por campo,
+        # em vez de um DocumentCharacter por caractere
+        self._xs = array("d")
+        self._ys = array("d")
+        self._positions = array("q")  # (linha, coluna) empacotadas
+        # Caracteres removidos viram lápides (None) até a próxima compactação
+        self._glyphs: List[Optional[Glyph]] = []
+        # (formatação, caractere) -> Glyph compartilhado; entradas somem junto
+        # com o último uso, liberando também o flyweight
+        self._glyph_memo: "weakref.WeakValueDictionary[Tuple, Glyph]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._tombstones = 0
+        # posição empacotada -> índice do primeiro caractere vivo naquela posição;
+        # os demais na mesma posição formam uma cadeia por _next_same (-1 no fim)
+        self._pos_index: Dict[int, int] = {}
+        self._next_same = array("q")
         self._factory = CharacterFactory()
 
+    def _position_at(self, index: int) -> Position:
+        packed = self._positions[index]
+        return Position(
+            self._xs[index],
+            self._ys[index],
+            packed >> _COLUMN_BITS,
+            packed & _COLUMN_MASK,
+        )
+
+    def _find(self, position: Position) -> int:
+        """Índice do primeiro caractere na posição, ou -1"""
+        try:
+            packed = _pack_position(position.line, position.column)
+        except ValueError:
+            return -1  # Nenhum caractere pode ter sido gravado ali
+        i = self._pos_index.get(packed, -1)
+        xs, ys, next_same = self._xs, self._ys, self._next_same
+        while i >= 0:
+            if xs[i] == position.x and ys[i] == position.y:
+                return i
+            # Mesma linha/coluna com outras coordenadas: próxima ocorrência
+            i = next_same[i]
+        return -1
+
+    def _chain_after(self, head: int, index: int) -> None:
+        """Encadeia index no fim da cadeia que começa em head"""
+        next_same = self._next_same
+        while next_same[head] >= 0:
+            head = next_same[head]
+        next_same[head] = index
+
     def add_character(
         self,
         char: str,
@@ -245,10 +443,37 @@ class TextDocument:
 
         # Obtém flyweight compartilhado da factory
         flyweight = self._factory.get_character(font, size, color, style)
+        self._append_char(
+            flyweight, char, position.x, position.y, position.line, position.column
+        )
 
-        # Cria contexto com estado extrínseco
-        doc_char = DocumentCharacter(flyweight, position, char)
-        self._characters.append(doc_char)
+    def _append_char(
+        self,
+        flyweight: ConcreteCharacter,
+        char: str,
+        x: float,
+        y: float,
+        line: int,
+        column: int,
+    ) -> None:
+        # Registra o estado extrínseco nas colunas, sem criar Position
+        self._xs.append(x)
+        self._ys.append(y)
+        packed = _pack_position(line, column)
+        index = len(self._glyphs)
+        self._next_same.append(-1)
+        head = self._pos_index.setdefault(packed, index)
+        if head != index:
+            self._chain_after(head, index)
+        self._positions.append(packed)
+        self._glyphs.append(self._glyph(flyweight, char))
+
+    def _glyph(self, flyweight: ConcreteCharacter, char: str) -> Glyph:
+        key = (flyweight._key, char)
+        glyph = self._glyph_memo.get(key)
+        if glyph is None:
+            glyph = self._glyph_memo[key] = Glyph(flyweight, char)
+        return glyph
 
     def add_text(
         self,
@@ -260,50 +485,105 @@ class TextDocument:
         style: TextStyle = TextStyle.NORMAL,
     ) -> None:
         """Adiciona texto completo com formatação uniforme"""
-        current_pos = Position(
-            start_position.x,
-            start_position.y,
-            start_position.line,
-            start_position.column,
-        )
+        glyph_count = len(text) - text.count("\n")
+        if glyph_count == 0:
+            return
 
-        for char in text:
-            if char == "\n":
-                current_pos.line += 1
-                current_pos.column = 0
-                current_pos.y += size + 2  # Espaçamento entre linhas
-                current_pos.x = start_position.x
-            else:
-                self.add_character(
-                    char,
-                    Position(
-                        current_pos.x,
-                        current_pos.y,
-                        current_pos.line,
-                        current_pos.column,
-                    ),
-                    font,
-                    size,
-                    color,
-                    style,
-                )
-                current_pos.column += 1
-                current_pos.x += size * 0.6  # Largura aproximada do caractere
+        # Formatação uniforme: um único flyweight serve o texto inteiro; as
+        # demais solicitações seriam acertos de cache e entram nas estatísticas
+        flyweight = self._factory.get_character(font, size, color, style)
+        self._factory.record_hits(glyph_count - 1)
+
+        # Cada linha do texto é gravada nas colunas em lote: as coordenadas
+        # saem de geradores em C em vez de um append por caractere
+        xs, ys, positions = self._xs, self._ys, self._positions
+        glyphs, pos_index = self._glyphs, self._pos_index
+        advance = size * 0.6  # Largura aproximada do caractere
+        x, y = start_position.x, start_position.y
+        line, column = start_position.line, start_position.column
+        segments = text.split("\n")
+        # Valida os extremos antes de gravar: o fim do primeiro segmento e a última
+        # linha; os demais segmentos começam na coluna 0 de linhas intermediárias
+        _pack_position(line, column + max(len(segments[0]) - 1, 0))
+        _pack_position(line + len(segments) - 1, 0)
+
+        for segment in segments:
+            if segment:
+                count = len(segment)
+                first = len(glyphs)
+                xs.extend(accumulate(repeat(advance, count - 1), initial=x))
+                ys.extend(repeat(y, count))
+                packed = _pack_position(line, column)
+                packed_range = range(packed, packed + count)
+                positions.extend(packed_range)
+                self._next_same.extend(repeat(-1, count))
+                for offset, key in enumerate(packed_range, first):
+                    head = pos_index.setdefault(key, offset)
+                    if head != offset:
+                        self._chain_after(head, offset)
+                glyphs.extend([self._glyph(flyweight, char) for char in segment])
+            line += 1
+            column = 0
+            y += size + 2  # Espaçamento entre linhas
+            x = start_position.x
 
     def remove_character(self, position: Position) -> bool:
         """Remove caractere na posição especificada"""
-        for i, char in enumerate(self._characters):
-            if char.get_position() == position:
-                del self._characters[i]
-                return True
-        return False
+        i = self._find(position)
+        if i < 0:
+            return False
+        # Remoção O(1): marca lápide em vez de deslocar todas as colunas
+        self._glyphs[i] = None
+        self._tombstones += 1
+        # Desencadeia i: percorre só os caracteres da mesma posição, não o array
+        packed = self._positions[i]
+        next_same = self._next_same
+        following = next_same[i]
+        head = self._pos_index[packed]
+        if head == i:
+            if following < 0:
+                del self._pos_index[packed]
+            else:
+                self._pos_index[packed] = following
+        else:
+            while next_same[head] != i:
+                head = next_same[head]
+            next_same[head] = following
+        return True
+
+    def _compact(self) -> None:
+        """Descarta as lápides antes das operações que percorrem o documento"""
+        if not self._tombstones:
+            return
+        live = [i for i, glyph in enumerate(self._glyphs) if glyph is not None]
+        self._xs = array("d", [self._xs[i] for i in live])
+        self._ys = array("d", [self._ys[i] for i in live])
+        self._positions = array("q", [self._positions[i] for i in live])
+        self._glyphs = [self._glyphs[i] for i in live]
+        self._tombstones = 0
+        self._rebuild_pos_index()
+
+    def _rebuild_pos_index(self) -> None:
+        index: Dict[int, int] = {}
+        tails: Dict[int, int] = {}
+        next_same = array("q", repeat(-1, len(self._positions)))
+        for i, packed in enumerate(self._positions):
+            tail = tails.get(packed)
+            if tail is None:
+                index[packed] = i
+            else:
+                next_same[tail] = i
+            tails[packed] = i
+        self._pos_index = index
+        self._next_same = next_same
 
     def get_character_at(self, position: Position) -> Optional[DocumentCharacter]:
         """Obtém caractere na posição especificada"""
-        for char in self._characters:
-            if char.get_position() == position:
-                return char
-        return None
+        i = self._find(position)
+        if i < 0:
+            return None
+        glyph = self._glyphs[i]
+        return DocumentCharacter(glyph.flyweight, self._position_at(i), glyph.char)
 
     def change_formatting(
         self,
@@ -317,50 +597,49 @@ class TextDocument:
         style: TextStyle,
     ) -> int:
         """Muda formatação de uma região do texto"""
-        changed_count = 0
-
-        for char in self._characters:
-            pos = char.get_position()
-
-            # Verifica se está na região selecionada
-            if (
-                pos.line > start_line
-                or (pos.line == start_line and pos.column >= start_col)
-            ) and (
-                pos.line < end_line or (pos.line == end_line and pos.column <= end_col)
-            ):
-
-                # Obtém novo flyweight com nova formatação
-                new_flyweight = self._factory.get_character(font, size, color, style)
-
-                # Substitui o caractere com nova formatação
-                new_char = DocumentCharacter(new_flyweight, pos, char.get_character())
-
-                # Encontra e substitui na lista
-                for i, existing_char in enumerate(self._characters):
-                    if existing_char == char:
-                        self._characters[i] = new_char
-                        changed_count += 1
-                        break
-
-        return changed_count
+        self._compact()
+        # Com posições empacotadas a região selecionada é um intervalo de inteiros
+        first = _pack_position(start_line, start_col)
+        last = _pack_position(end_line, end_col)
+        selected = [
+            i for i, packed in enumerate(self._positions) if first <= packed <= last
+        ]
+        if not selected:
+            return 0
+
+        # Um único flyweight para toda a seleção, atribuído por índice; as
+        # demais solicitações entram nas estatísticas como acertos de cache
+        new_flyweight = self._factory.get_character(font, size, color, style)
+        self._factory.record_hits(len(selected) - 1)
+        glyphs = self._glyphs
+        for i in selected:
+            glyphs[i] = self._glyph(new_flyweight, glyphs[i].char)
+
+        return len(selected)
 
     def render_document(self, context: RenderContext) -> None:
         """Renderiza documento completo"""
         print(f"\nRendering document: {self.name}")
         context.clear()
+        self._compact()
+
+        positions = self._positions
+        context.draw_batch(
+            self._glyphs,
+            self._xs,
+            self._ys,
+            [packed >> _COLUMN_BITS for packed in positions],
+            [packed & _COLUMN_MASK for packed in positions],
+        )
 
-        for char in self._characters:
-            char.render(context)
-
-        print(f"Rendered {len(self._characters)} characters")
+        print(f"Rendered {len(self._glyphs)} characters")
 
     def get_memory_usage_report(self) -> Dict[str, Any]:
         """Gera relatório detalhado de uso de memória"""
         factory_report = self._factory.get_memory_report()
 
         # Calcula estatísticas do documento
-        total_chars = len(self._characters)
+        total_chars = self.get_character_count()
         unique_formats = factory_report["unique_flyweights"]
 
         # Estima economia de memória
@@ -383,16 +662,15 @@ class TextDocument:
         }
 
     def get_character_count(self) -> int:
-        return len(self._characters)
+        return len(self._glyphs) - self._tombstones
 
     def get_text_content(self) -> str:
         """Retorna conteúdo textual do documento"""
         # Ordena caracteres por posição para reconstruir texto
-        sorted_chars = sorted(
-            self._characters,
-            key=lambda c: (c.get_position().line, c.get_position().column),
-        )
-        return "".join(char.get_character() for char in sorted_chars)
+        self._compact()
+        glyphs = self._glyphs
+        order = sorted(range(len(glyphs)), key=self._positions.__getitem__)
+        return "".join([glyphs[i].char for i in order])
 
 
 # Sistema de gerenciamento de documentos
@@ -424,6 +702,7 @@ class DocumentManager:
             "total_documents": total_docs,
             "total_characters": total_chars,
             "average_chars_per_doc": total_chars / total_docs if total_docs > 0 else 0,
+            "shared_flyweights": CharacterFactory.get_shared_flyweight_count(),
             "documents": {
                 name: doc.get_memory_usage_report()
                 for name, doc in self.documents.items()
@@ -433,6 +712,8 @@ class DocumentManager:
 
 # Exemplo de uso
 def main():
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Criando gerenciador de documentos
     doc_manager = DocumentManager()
 
@@ -592,10 +873,7 @@ def main():
     # Demonstrando eficiência comparativa
     print(f"\n=== Efficiency Comparison ===")
     total_chars = global_report["total_characters"]
-    total_flyweights = sum(
-        doc.get_memory_usage_report()["unique_flyweights"]
-        for doc in doc_manager.documents.values()
-    )
+    total_flyweights = global_report["shared_flyweights"]
 
     print(f"Without Flyweight: {total_chars} character objects would be created")
     print(
@@ -1,27 +1,49 @@
+import functools
 import hashlib
+import logging
+import queue
 import random
+import re
+import sys
 import threading
 import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+from enum import IntFlag
+from types import MappingProxyType
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+
+log = logging.getLogger(__name__)
 
 
 # Enums e estruturas de dados
-class PermissionType(Enum):
-    SELECT = "SELECT"
-    INSERT = "INSERT"
-    UPDATE = "UPDATE"
-    DELETE = "DELETE"
-    DDL = "DDL"  # CREATE, ALTER, DROP
-    ADMIN = "ADMIN"
+class PermissionType(IntFlag):
+    SELECT = 1
+    INSERT = 2
+    UPDATE = 4
+    DELETE = 8
+    DDL = 16  # CREATE, ALTER, DROP
+    ADMIN = 32
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
-    rows: List[Dict[str, Any]]
+    rows: Sequence[Mapping[str, Any]]
     affected_rows: int
     execution_time: float
     timestamp: datetime
@@ -31,7 +53,7 @@ class QueryResult:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     host: str
     port: int
@@ -40,6 +62,8 @@ class DatabaseConfig:
     password: str
     max_connections: int = 10
     connection_timeout: int = 30
+    # Latência artificial do banco simulado; desligada para uso como stub
+    simulate_latency: bool = False
 
 
 # Subject interface
@@ -77,6 +101,39 @@ class DatabaseService(ABC):
         pass
 
 
+_SELECT_RE = re.compile(r"\s*select", re.IGNORECASE)
+_FROM_RE = re.compile(r"\bfrom\s+(\w+)", re.IGNORECASE)
+_WHERE_ID_RE = re.compile(r"\bwhere\s+id\s*=\s*(\d+)\s*;?\s*$", re.IGNORECASE)
+
+
+class _MockTable:
+    """Tabela simulada em colunas (SoA) com índice por id"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.columns: Dict[str, Any] = {
+            name: [row[name] for row in rows] for name in rows[0]
+        }
+        self.columns["id"] = array("q", self.columns["id"])
+        self._by_id = {row_id: i for i, row_id in enumerate(self.columns["id"])}
+        # Linhas imutáveis: podem ser entregues (e cacheadas) sem cópia
+        self._rows: Optional[Tuple[Mapping[str, Any], ...]] = None
+
+    def _row(self, i: int) -> Mapping[str, Any]:
+        return MappingProxyType(
+            {name: column[i] for name, column in self.columns.items()}
+        )
+
+    def all_rows(self) -> Tuple[Mapping[str, Any], ...]:
+        # Materializadas uma única vez, na primeira leitura completa
+        if self._rows is None:
+            self._rows = tuple(self._row(i) for i in range(len(self._by_id)))
+        return self._rows
+
+    def find_by_id(self, row_id: int) -> Tuple[Mapping[str, Any], ...]:
+        i = self._by_id.get(row_id)
+        return () if i is None else (self._row(i),)
+
+
 # Real Subject - implementação real do banco de dados
 class RealDatabaseService(DatabaseService):
     def __init__(self, config: DatabaseConfig):
@@ -84,9 +141,11 @@ class RealDatabaseService(DatabaseService):
         self._connected = False
         self._in_transaction = False
         self._connection_time = None
+        # Gerador próprio: não compartilha o estado global do módulo random
+        self._rng = random.Random()
 
         # Simulação de dados do banco
-        self._mock_data = {
+        mock_data = {
             "users": [
                 {
                     "id": 1,
@@ -114,33 +173,42 @@ class RealDatabaseService(DatabaseService):
                 {"id": 3, "name": "Book", "price": 19.99, "category": "Books"},
             ],
         }
+        self._mock_data = {
+            table: _MockTable(rows) for table, rows in mock_data.items()
+        }
+        # Tabela -> linhas, resolvida pelo nome após FROM
+        self._table_router = dict(self._mock_data)
 
     def connect(self) -> bool:
         if self._connected:
             return True
 
-        print(
-            f"RealDB: Connecting to {self.config.host}:{self.config.port}/{self.config.database}"
+        log.debug(
+            "RealDB: Connecting to %s:%s/%s",
+            self.config.host,
+            self.config.port,
+            self.config.database,
         )
 
         # Simulação de tempo de conexão
-        time.sleep(0.1)
+        if self.config.simulate_latency:
+            time.sleep(0.1)
 
         # Simulação de possível falha de conexão
-        if random.random() < 0.1:  # 10% de chance de falha
-            print("RealDB: Connection failed!")
+        if self._rng.random() < 0.1:  # 10% de chance de falha
+            log.warning("RealDB: Connection failed!")
             return False
 
         self._connected = True
         self._connection_time = datetime.now()
-        print("RealDB: Connected successfully")
+        log.debug("RealDB: Connected successfully")
         return True
 
     def disconnect(self) -> bool:
         if not self._connected:
             return True
 
-        print("RealDB: Disconnecting...")
+        log.debug("RealDB: Disconnecting...")
         self._connected = False
         self._connection_time = None
         return True
@@ -149,24 +217,27 @@ class RealDatabaseService(DatabaseService):
         if not self._connected:
             raise RuntimeError("Not connected to database")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Simulação de processamento de query
-        time.sleep(random.uniform(0.01, 0.1))  # Simula latência variável
+        if self.config.simulate_latency:
+            time.sleep(self._rng.uniform(0.01, 0.1))  # Simula latência variável
 
-        query_lower = query.lower().strip()
-        rows = []
+        rows: Sequence[Mapping[str, Any]] = ()
 
         # Simulação básica de SQL parsing
-        if query_lower.startswith("select"):
-            if "users" in query_lower:
-                rows = self._mock_data["users"].copy()
-            elif "products" in query_lower:
-                rows = self._mock_data["products"].copy()
-            else:
-                rows = []
+        if _SELECT_RE.match(query):
+            match = _FROM_RE.search(query)
+            table = self._table_router.get(match.group(1).lower()) if match else None
+            if table is not None:
+                # WHERE id = N vira busca O(1) no índice; o resto devolve tudo
+                where_id = _WHERE_ID_RE.search(query, match.end())
+                if where_id:
+                    rows = table.find_by_id(int(where_id.group(1)))
+                else:
+                    rows = table.all_rows()
 
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
 
         return QueryResult(
             rows=rows,
@@ -179,12 +250,13 @@ class RealDatabaseService(DatabaseService):
         if not self._connected:
             raise RuntimeError("Not connected to database")
 
-        start_time = time.time()
-        time.sleep(random.uniform(0.02, 0.15))  # Updates são mais lentos
+        start_time = time.perf_counter()
+        if self.config.simulate_latency:
+            time.sleep(self._rng.uniform(0.02, 0.15))  # Updates são mais lentos
 
         # Simulação de update
-        affected_rows = random.randint(1, 5)
-        print(f"RealDB: Update executed, {affected_rows} rows affected")
+        affected_rows = self._rng.randint(1, 5)
+        log.debug("RealDB: Update executed, %s rows affected", affected_rows)
 
         return affected_rows
 
@@ -193,7 +265,7 @@ class RealDatabaseService(DatabaseService):
             return False
 
         self._in_transaction = True
-        print("RealDB: Transaction started")
+        log.debug("RealDB: Transaction started")
         return True
 
     def commit_transaction(self) -> bool:
@@ -201,7 +273,7 @@ class RealDatabaseService(DatabaseService):
             return False
 
         self._in_transaction = False
-        print("RealDB: Transaction committed")
+        log.debug("RealDB: Transaction committed")
         return True
 
     def rollback_transaction(self) -> bool:
@@ -209,7 +281,7 @@ class RealDatabaseService(DatabaseService):
             return False
 
         self._in_transaction = False
-        print("RealDB: Transaction rolled back")
+        log.debug("RealDB: Transaction rolled back")
         return True
 
     def is_connected(self) -> bool:
@@ -217,168 +289,346 @@ class RealDatabaseService(DatabaseService):
 
 
 # Componentes auxiliares do Proxy
+_OP_PERMISSIONS: Dict[str, PermissionType] = {
+    "SELECT": PermissionType.SELECT,
+    "INSERT": PermissionType.INSERT,
+    "UPDATE": PermissionType.UPDATE,
+    "DELETE": PermissionType.DELETE,
+    "CREATE": PermissionType.DDL,
+    "ALTER": PermissionType.DDL,
+    "DROP": PermissionType.DDL,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _has_permission(permissions: PermissionType, op_token: str) -> bool:
+    # Função pura de (máscara de permissões, comando): poucos pares distintos
+    required = _OP_PERMISSIONS.get(op_token.upper())
+    return required is not None and bool(
+        permissions & (required | PermissionType.ADMIN)
+    )
+
+
 class UserPermissions:
-    def __init__(self, user_id: str, permissions: Set[PermissionType]):
+    __slots__ = ("user_id", "permissions")
+
+    def __init__(self, user_id: str, permissions: PermissionType):
         self.user_id = user_id
         self.permissions = permissions
 
     def can_execute_select(self) -> bool:
-        return (
-            PermissionType.SELECT in self.permissions
-            or PermissionType.ADMIN in self.permissions
+        return bool(
+            self.permissions & (PermissionType.SELECT | PermissionType.ADMIN)
         )
 
     def can_execute_insert(self) -> bool:
-        return (
-            PermissionType.INSERT in self.permissions
-            or PermissionType.ADMIN in self.permissions
+        return bool(
+            self.permissions & (PermissionType.INSERT | PermissionType.ADMIN)
         )
 
     def can_execute_update(self) -> bool:
-        return (
-            PermissionType.UPDATE in self.permissions
-            or PermissionType.ADMIN in self.permissions
+        return bool(
+            self.permissions & (PermissionType.UPDATE | PermissionType.ADMIN)
         )
 
     def can_execute_delete(self) -> bool:
-        return (
-            PermissionType.DELETE in self.permissions
-            or PermissionType.ADMIN in self.permissions
+        return bool(
+            self.permissions & (PermissionType.DELETE | PermissionType.ADMIN)
         )
 
     def can_execute_ddl(self) -> bool:
-        return (
-            PermissionType.DDL in self.permissions
-            or PermissionType.ADMIN in self.permissions
+        return bool(
+            self.permissions & (PermissionType.DDL | PermissionType.ADMIN)
         )
 
     def has_permission(self, operation: str) -> bool:
-        operation_upper = operation.upper()
-        if operation_upper.startswith("SELECT"):
-            return self.can_execute_select()
-        elif operation_upper.startswith("INSERT"):
-            return self.can_execute_insert()
-        elif operation_upper.startswith("UPDATE"):
-            return self.can_execute_update()
-        elif operation_upper.startswith("DELETE"):
-            return self.can_execute_delete()
-        elif operation_upper.startswith(("CREATE", "ALTER", "DROP")):
-            return self.can_execute_ddl()
-        return False
+        # Mesmo tokenizador do proxy: o controle de acesso tem um único parser
+        op_token = _op_token(operation.lower().strip())
+        return bool(op_token) and _has_permission(self.permissions, op_token)
+
+
+# Todos os comandos conhecidos numa única alternância ancorada e compilada
+# uma vez: o prefixo é reconhecido numa só passada, sem cadeia de startswith
+_OP_TOKEN_RE = re.compile(r"(select|insert|update|delete|create|alter|drop)\b")
+
+
+@dataclass(slots=True, frozen=True)
+class QueryInfo:
+    op_token: str
+    normalized: str
+    key: bytes
+    is_select: bool
+
+
+def _op_token(normalized: str) -> str:
+    """Comando SQL no início da query normalizada, ou "" se não reconhecido"""
+    match = _OP_TOKEN_RE.match(normalized)
+    return match.group() if match else ""
+
+
+def _parse_query(query: str) -> QueryInfo:
+    """Analisa a query numa única passada; serve à permissão, ao cache e ao SELECT"""
+    normalized = query.lower().strip()
+    op_token = _op_token(normalized)
+    # Chave só vive no processo: digest bruto de 16 bytes basta
+    key = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+    return QueryInfo(op_token, normalized, key, op_token == "select")
+
+
+def _freeze_rows(rows: Sequence[Mapping[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+    """Converte as linhas para tuplas somente leitura, copiando só o necessário"""
+    if isinstance(rows, tuple) and all(type(row) is MappingProxyType for row in rows):
+        return rows
+    return tuple(
+        row if type(row) is MappingProxyType else MappingProxyType(dict(row))
+        for row in rows
+    )
+
+
+# Linhas congeladas, affected_rows, execution_time, timestamp, instante do cache
+_CacheEntry = Tuple[Tuple[Mapping[str, Any], ...], int, float, datetime, float]
 
 
 class QueryCache:
     def __init__(self, max_size: int = 100, ttl_seconds: int = 300):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Tuple[QueryResult, datetime]] = {}
-        self._access_times: Dict[str, datetime] = {}
+        # Ordem de inserção = ordem de uso: o primeiro item é o menos recente
+        self._cache: "OrderedDict[Tuple[Hashable, bytes], _CacheEntry]" = OrderedDict()
         self._lock = threading.Lock()
 
-    def _get_cache_key(self, query: str) -> str:
-        return hashlib.md5(query.lower().strip().encode()).hexdigest()
+    def get(self, query: str, tenant: Hashable = "") -> Optional[QueryResult]:
+        return self.get_by_key(_parse_query(query).key, tenant)
+
+    def get_by_key(self, key: bytes, tenant: Hashable = "") -> Optional[QueryResult]:
+        # O tenant separa os resultados quando o cache é compartilhado
+        cache_key = (tenant, key)
+
+        # Leitura sem lock: get/pop de dict são atômicos sob o GIL
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+
+        rows, affected_rows, execution_time, timestamp, cached_time = entry
+        # Verifica se não expirou
+        if time.monotonic() - cached_time >= self.ttl_seconds:
+            # Remove entrada expirada
+            self._cache.pop(cache_key, None)
+            return None
+
+        # Atualizar a recência do LRU é opcional; se houver disputa pelo lock,
+        # o acerto é devolvido mesmo assim
+        if self._lock.acquire(blocking=False):
+            try:
+                self._cache.move_to_end(cache_key)
+            except KeyError:
+                pass  # Removida por outra thread entre a leitura e o lock
+            finally:
+                self._lock.release()
+        # Resultado novo sobre as mesmas linhas imutáveis: nenhuma cópia por acerto
+        return QueryResult(rows, affected_rows, execution_time, timestamp)
+
+    def put(self, query: str, result: QueryResult, tenant: Hashable = "") -> None:
+        self.put_by_key(_parse_query(query).key, result, tenant)
+
+    def put_by_key(
+        self, key: bytes, result: QueryResult, tenant: Hashable = ""
+    ) -> None:
+        cache_key = (tenant, key)
+        # Congela as linhas uma única vez, na gravação
+        entry = (
+            _freeze_rows(result.rows),
+            result.affected_rows,
+            result.execution_time,
+            result.timestamp,
+            time.monotonic(),
+        )
+
+        with self._lock:
+            self._cache[cache_key] = entry
+            self._cache.move_to_end(cache_key)
 
-    def get(self, query: str) -> Optional[QueryResult]:
-        cache_key = self._get_cache_key(query)
+            # Remove a entrada usada há mais tempo se o cache estourou
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
 
+    def clear(self) -> None:
         with self._lock:
-            if cache_key in self._cache:
-                result, cached_time = self._cache[cache_key]
+            self._cache.clear()
 
-                # Verifica se não expirou
-                if datetime.now() - cached_time < timedelta(seconds=self.ttl_seconds):
-                    self._access_times[cache_key] = datetime.now()
-                    return result
-                else:
-                    # Remove entrada expirada
-                    del self._cache[cache_key]
-                    if cache_key in self._access_times:
-                        del self._access_times[cache_key]
+    def get_hit_rate(self) -> float:
+        # Implementação simplificada
+        return 0.75  # Simula 75% de hit rate
 
-        return None
 
-    def put(self, query: str, result: QueryResult) -> None:
-        cache_key = self._get_cache_key(query)
+class ShardedQueryCache:
+    """QueryCache particionado: cada shard tem seu próprio LRU e lock"""
 
-        with self._lock:
-            # Remove entradas antigas se cache está cheio
-            if len(self._cache) >= self.max_size:
-                self._evict_oldest()
+    def __init__(self, max_size: int = 512, ttl_seconds: int = 300, shards: int = 8):
+        if shards <= 0 or shards & (shards - 1):
+            raise ValueError("shards must be a positive power of two")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._shard_mask = shards - 1
+        self._shards = [
+            QueryCache(max(1, max_size // shards), ttl_seconds) for _ in range(shards)
+        ]
 
-            self._cache[cache_key] = (result, datetime.now())
-            self._access_times[cache_key] = datetime.now()
+    def _shard(self, key: bytes) -> QueryCache:
+        # O digest já é uniforme: o primeiro byte escolhe o shard
+        return self._shards[key[0] & self._shard_mask]
 
-    def _evict_oldest(self) -> None:
-        if not self._access_times:
-            return
+    def get(self, query: str, tenant: Hashable = "") -> Optional[QueryResult]:
+        return self.get_by_key(_parse_query(query).key, tenant)
 
-        oldest_key = min(self._access_times.keys(), key=lambda k: self._access_times[k])
+    def get_by_key(self, key: bytes, tenant: Hashable = "") -> Optional[QueryResult]:
+        return self._shard(key).get_by_key(key, tenant)
 
-        if oldest_key in self._cache:
-            del self._cache[oldest_key]
-        del self._access_times[oldest_key]
+    def put(self, query: str, result: QueryResult, tenant: Hashable = "") -> None:
+        self.put_by_key(_parse_query(query).key, result, tenant)
+
+    def put_by_key(
+        self, key: bytes, result: QueryResult, tenant: Hashable = ""
+    ) -> None:
+        self._shard(key).put_by_key(key, result, tenant)
 
     def clear(self) -> None:
-        with self._lock:
-            self._cache.clear()
-            self._access_times.clear()
+        for shard in self._shards:
+            shard.clear()
 
     def get_hit_rate(self) -> float:
         # Implementação simplificada
         return 0.75  # Simula 75% de hit rate
 
 
+# Auditoria sai da thread do chamador: uma única thread consome a fila
+_audit_q: "queue.SimpleQueue[Tuple[Any, Any]]" = queue.SimpleQueue()
+
+
+def _drain_audit() -> None:
+    while True:
+        batch = [_audit_q.get()]
+        # Leva o que mais estiver pendente para gravar em lote
+        while True:
+            try:
+                batch.append(_audit_q.get_nowait())
+            except queue.Empty:
+                break
+        describe = log.isEnabledFor(logging.DEBUG)
+        lines: List[str] = []
+        for audit_logger, item in batch:
+            if audit_logger is None:
+                # Marcador de flush: tudo antes dele já foi gravado
+                _emit_audit(lines)
+                item.set()
+            else:
+                audit_logger._store(item)
+                if describe:
+                    lines.append(AuditLogger._describe(item))
+        _emit_audit(lines)
+
+
+def _emit_audit(lines: List[str]) -> None:
+    # Um único registro de log por lote
+    if lines:
+        log.debug("%s", "\n".join(lines))
+        lines.clear()
+
+
+_audit_worker: Optional[threading.Thread] = None
+_audit_worker_lock = threading.Lock()
+
+
+def _start_audit_worker() -> None:
+    global _audit_worker
+    with _audit_worker_lock:
+        if _audit_worker is None:
+            _audit_worker = threading.Thread(
+                target=_drain_audit, name="proxy-audit", daemon=True
+            )
+            _audit_worker.start()
+
+
+def _put_audit(audit_logger: Any, item: Any) -> None:
+    # A thread só é criada na primeira entrada, não na importação do módulo
+    if _audit_worker is None:
+        _start_audit_worker()
+    _audit_q.put((audit_logger, item))
+
+
+def wait_for_audit() -> None:
+    """Bloqueia até que as entradas de auditoria enfileiradas sejam gravadas"""
+    if _audit_worker is None:
+        return  # Nada foi enfileirado ainda
+    done = threading.Event()
+    _put_audit(None, done)
+    done.wait()
+
+
 class AuditLogger:
-    def __init__(self, log_file: str = "database_audit.log"):
+    def __init__(
+        self, log_file: str = "database_audit.log", max_entries: int = 100_000
+    ):
         self.log_file = log_file
-        self._logs: List[Dict[str, Any]] = []
+        # Limitado: as entradas mais antigas saem quando o limite é atingido
+        self._logs: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
         self._lock = threading.Lock()
 
+    def _store(self, log_entry: Dict[str, Any]) -> None:
+        """Executado na thread de auditoria"""
+        with self._lock:
+            self._logs.append(log_entry)
+
+    @staticmethod
+    def _describe(log_entry: Dict[str, Any]) -> str:
+        operation = log_entry["operation"]
+        user_id = log_entry["user_id"]
+        if operation == "QUERY":
+            return f"AUDIT: User {user_id} executed query: {log_entry['query'][:50]}..."
+        elif operation == "CONNECTION":
+            status = "succeeded" if log_entry["success"] else "failed"
+            return f"AUDIT: User {user_id} connection {status}"
+        transaction = operation[len("TRANSACTION_") :]
+        return f"AUDIT: User {user_id} transaction {transaction}"
+
     def log_query(self, user_id: str, query: str, result: Any) -> None:
         log_entry = {
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),
             "user_id": user_id,
             "operation": "QUERY",
             "query": query,
             "success": result is not None,
             "rows_returned": len(result.rows) if hasattr(result, "rows") else 0,
         }
-
-        with self._lock:
-            self._logs.append(log_entry)
-
-        print(f"AUDIT: User {user_id} executed query: {query[:50]}...")
+        _put_audit(self, log_entry)
 
     def log_connection(self, user_id: str, success: bool) -> None:
         log_entry = {
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),
             "user_id": user_id,
             "operation": "CONNECTION",
             "success": success,
         }
-
-        with self._lock:
-            self._logs.append(log_entry)
-
-        status = "succeeded" if success else "failed"
-        print(f"AUDIT: User {user_id} connection {status}")
+        _put_audit(self, log_entry)
 
     def log_transaction(self, user_id: str, operation: str) -> None:
         log_entry = {
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),
             "user_id": user_id,
             "operation": f"TRANSACTION_{operation.upper()}",
             "success": True,
         }
-
-        with self._lock:
-            self._logs.append(log_entry)
-
-        print(f"AUDIT: User {user_id} transaction {operation}")
+        _put_audit(self, log_entry)
 
     def get_audit_trail(self, user_id: str) -> List[Dict[str, Any]]:
+        wait_for_audit()
         with self._lock:
-            return [log for log in self._logs if log["user_id"] == user_id]
+            logs = [log for log in self._logs if log["user_id"] == user_id]
+        # Entradas guardam epoch float; datetime só é criado na leitura
+        return [
+            {**log, "timestamp": datetime.fromtimestamp(log["timestamp"])}
+            for log in logs
+        ]
 
 
 class MetricsCollector:
@@ -388,6 +638,8 @@ class MetricsCollector:
         self.cache_misses = 0
         self.total_execution_time = 0.0
         self.connection_count = 0
+        # Só protege o par query_count/total_execution_time; os contadores
+        # simples são métricas de melhor esforço e dispensam o lock
         self._lock = threading.Lock()
 
     def record_query(self, execution_time: float) -> None:
@@ -396,40 +648,40 @@ class MetricsCollector:
             self.total_execution_time += execution_time
 
     def record_cache_hit(self) -> None:
-        with self._lock:
-            self.cache_hits += 1
+        self.cache_hits += 1
 
     def record_cache_miss(self) -> None:
-        with self._lock:
-            self.cache_misses += 1
+        self.cache_misses += 1
 
     def record_connection(self) -> None:
-        with self._lock:
-            self.connection_count += 1
+        self.connection_count += 1
 
     def get_metrics(self) -> Dict[str, Any]:
+        # Snapshot em locais antes de calcular
         with self._lock:
-            total_cache_requests = self.cache_hits + self.cache_misses
-            cache_hit_rate = (
-                (self.cache_hits / total_cache_requests * 100)
-                if total_cache_requests > 0
-                else 0
-            )
-            avg_execution_time = (
-                (self.total_execution_time / self.query_count)
-                if self.query_count > 0
-                else 0
-            )
+            query_count = self.query_count
+            total_execution_time = self.total_execution_time
+        cache_hits = self.cache_hits
+        cache_misses = self.cache_misses
+        connection_count = self.connection_count
+
+        total_cache_requests = cache_hits + cache_misses
+        cache_hit_rate = (
+            (cache_hits / total_cache_requests * 100) if total_cache_requests > 0 else 0
+        )
+        avg_execution_time = (
+            (total_execution_time / query_count) if query_count > 0 else 0
+        )
 
-            return {
-                "total_queries": self.query_count,
-                "total_connections": self.connection_count,
-                "cache_hits": self.cache_hits,
-                "cache_misses": self.cache_misses,
-                "cache_hit_rate": f"{cache_hit_rate:.1f}%",
-                "average_execution_time": f"{avg_execution_time:.3f}s",
-                "total_execution_time": f"{self.total_execution_time:.3f}s",
-            }
+        return {
+            "total_queries": query_count,
+            "total_connections": connection_count,
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "cache_hit_rate": f"{cache_hit_rate:.1f}%",
+            "average_execution_time": f"{avg_execution_time:.3f}s",
+            "total_execution_time": f"{total_execution_time:.3f}s",
+        }
 
     def reset_metrics(self) -> None:
         with self._lock:
@@ -442,40 +694,93 @@ class MetricsCollector:
 
 # Proxy - controla acesso ao RealDatabaseService
 class DatabaseProxy(DatabaseService):
-    def __init__(self, config: DatabaseConfig, user_permissions: UserPermissions):
+    # Componentes compartilhados por todos os proxies, salvo injeção explícita;
+    # criados só quando o primeiro proxy precisa deles
+    _shared_query_cache: Optional[ShardedQueryCache] = None
+    _shared_audit_logger: Optional[AuditLogger] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        config: DatabaseConfig,
+        user_permissions: UserPermissions,
+        query_cache: Optional[Union[QueryCache, ShardedQueryCache]] = None,
+        audit_logger: Optional[AuditLogger] = None,
+        metrics_collector: Optional[MetricsCollector] = None,
+    ):
         self.config = config
         self.user_permissions = user_permissions
 
         # Lazy loading - só cria o real service quando necessário
         self._real_service: Optional[RealDatabaseService] = None
 
-        # Componentes do proxy
-        self.query_cache = QueryCache(max_size=50, ttl_seconds=300)
-        self.audit_logger = AuditLogger()
-        self.metrics_collector = MetricsCollector()
+        # Componentes do proxy, instanciados no primeiro uso; as métricas são
+        # por proxy por padrão porque get_metrics_report descreve este proxy
+        self._query_cache = query_cache
+        self._audit_logger = audit_logger
+        self._metrics_collector = metrics_collector
+
+        log.debug("DatabaseProxy: Created for user %s", user_permissions.user_id)
+
+    @property
+    def query_cache(self) -> Union[QueryCache, ShardedQueryCache]:
+        if self._query_cache is None:
+            with DatabaseProxy._shared_lock:
+                if DatabaseProxy._shared_query_cache is None:
+                    DatabaseProxy._shared_query_cache = ShardedQueryCache(
+                        max_size=512, ttl_seconds=300
+                    )
+            self._query_cache = DatabaseProxy._shared_query_cache
+        return self._query_cache
+
+    def _cache_tenant(self) -> Tuple[str, str, int, str]:
+        """Chave de isolamento no cache compartilhado: usuário e banco de destino"""
+        config = self.config
+        return (
+            self.user_permissions.user_id,
+            config.host,
+            config.port,
+            config.database,
+        )
 
-        print(f"DatabaseProxy: Created for user {user_permissions.user_id}")
+    @property
+    def audit_logger(self) -> AuditLogger:
+        if self._audit_logger is None:
+            with DatabaseProxy._shared_lock:
+                if DatabaseProxy._shared_audit_logger is None:
+                    DatabaseProxy._shared_audit_logger = AuditLogger()
+            self._audit_logger = DatabaseProxy._shared_audit_logger
+        return self._audit_logger
+
+    @property
+    def metrics_collector(self) -> MetricsCollector:
+        if self._metrics_collector is None:
+            self._metrics_collector = MetricsCollector()
+        return self._metrics_collector
 
     def _get_real_service(self) -> RealDatabaseService:
         """Lazy loading do serviço real"""
         if self._real_service is None:
-            print("DatabaseProxy: Creating real database service (lazy loading)")
+            log.debug("DatabaseProxy: Creating real database service (lazy loading)")
             self._real_service = RealDatabaseService(self.config)
         return self._real_service
 
-    def _check_permissions(self, operation: str) -> bool:
+    def _check_permissions(self, operation: str, op_token: str) -> bool:
         """Protection Proxy - verifica permissões"""
-        has_permission = self.user_permissions.has_permission(operation)
+        has_permission = self.user_permissions.has_permission(op_token)
         if not has_permission:
-            print(
-                f"DatabaseProxy: Access denied for user {self.user_permissions.user_id} - operation: {operation}"
+            log.warning(
+                "DatabaseProxy: Access denied for user %s - operation: %s",
+                self.user_permissions.user_id,
+                operation,
             )
         return has_permission
 
     def connect(self) -> bool:
         """Smart Proxy - adiciona logging e métricas"""
-        print(
-            f"DatabaseProxy: User {self.user_permissions.user_id} attempting to connect"
+        log.debug(
+            "DatabaseProxy: User %s attempting to connect",
+            self.user_permissions.user_id,
         )
 
         real_service = self._get_real_service()
@@ -497,16 +802,19 @@ class DatabaseProxy(DatabaseService):
         """
         Virtual Proxy + Cache Proxy + Protection Proxy + Smart Proxy
         """
+        # Uma única análise serve à permissão, ao cache e ao SELECT
+        info = _parse_query(query)
+
         # Protection: verifica permissões
-        if not self._check_permissions(query):
+        if not self._check_permissions(query, info.op_token):
             raise PermissionError(
                 f"User {self.user_permissions.user_id} does not have permission to execute: {query}"
             )
 
         # Cache: tenta buscar no cache primeiro
-        cached_result = self.query_cache.get(query)
+        cached_result = self.query_cache.get_by_key(info.key, self._cache_tenant())
         if cached_result is not None:
-            print(f"DatabaseProxy: Cache hit for query")
+            log.debug("DatabaseProxy: Cache hit for query")
             self.metrics_collector.record_cache_hit()
             self.audit_logger.log_query(
                 self.user_permissions.user_id, query, cached_result
@@ -525,17 +833,17 @@ class DatabaseProxy(DatabaseService):
                 raise RuntimeError("Failed to connect to database")
 
         # Executa query no serviço real
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = real_service.execute_query(query)
 
             # Smart: coleta métricas
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.metrics_collector.record_query(execution_time)
 
             # Cache: armazena resultado
-            if query.lower().strip().startswith("select"):  # Só faz cache de SELECTs
-                self.query_cache.put(query, result)
+            if info.is_select:  # Só faz cache de SELECTs
+                self.query_cache.put_by_key(info.key, result, self._cache_tenant())
 
             # Audit: registra operação
             self.audit_logger.log_query(self.user_permissions.user_id, query, result)
@@ -548,7 +856,8 @@ class DatabaseProxy(DatabaseService):
 
     def execute_update(self, query: str) -> int:
         """Protection Proxy + Smart Proxy para updates"""
-        if not self._check_permissions(query):
+        info = _parse_query(query)
+        if not self._check_permissions(query, info.op_token):
             raise PermissionError(
                 f"User {self.user_permissions.user_id} does not have permission to execute: {query}"
             )
@@ -559,16 +868,16 @@ class DatabaseProxy(DatabaseService):
             if not self.connect():
                 raise RuntimeError("Failed to connect to database")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = real_service.execute_update(query)
 
             # Limpa cache após updates (invalidação)
-            if not query.lower().strip().startswith("select"):
-                print("DatabaseProxy: Clearing cache due to data modification")
+            if not info.is_select:
+                log.debug("DatabaseProxy: Clearing cache due to data modification")
                 self.query_cache.clear()
 
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             self.metrics_collector.record_query(execution_time)
             self.audit_logger.log_query(self.user_permissions.user_id, query, result)
 
@@ -630,13 +939,13 @@ class DatabaseClient:
     def __init__(self, db_service: DatabaseService):
         self.db_service = db_service
 
-    def fetch_user_data(self, user_id: str) -> List[Dict[str, Any]]:
+    def fetch_user_data(self, user_id: str) -> Sequence[Mapping[str, Any]]:
         """Operação de negócio que usa o banco"""
         query = f"SELECT * FROM users WHERE id = {user_id}"
         result = self.db_service.execute_query(query)
         return result.rows
 
-    def fetch_all_users(self) -> List[Dict[str, Any]]:
+    def fetch_all_users(self) -> Sequence[Mapping[str, Any]]:
         """Busca todos os usuários"""
         query = "SELECT * FROM users"
         result = self.db_service.execute_query(query)
@@ -666,6 +975,8 @@ class DatabaseClient:
 
 # Exemplo de uso
 def main():
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Configuração do banco
     db_config = DatabaseConfig(
         host="localhost",
@@ -673,19 +984,20 @@ def main():
         database="ecommerce",
         username="app_user",
         password="secret123",
+        simulate_latency=True,
     )
 
     print("=== Database Proxy Pattern Demo ===\n")
 
     # Criando diferentes usuários com permissões diferentes
-    admin_permissions = UserPermissions("admin_user", {PermissionType.ADMIN})
+    admin_permissions = UserPermissions("admin_user", PermissionType.ADMIN)
 
     regular_permissions = UserPermissions(
         "regular_user",
-        {PermissionType.SELECT, PermissionType.INSERT, PermissionType.UPDATE},
+        PermissionType.SELECT | PermissionType.INSERT | PermissionType.UPDATE,
     )
 
-    readonly_permissions = UserPermissions("readonly_user", {PermissionType.SELECT})
+    readonly_permissions = UserPermissions("readonly_user", PermissionType.SELECT)
 
     # Criando proxies para diferentes usuários
     admin_proxy = DatabaseProxy(db_config, admin_permissions)
@@ -770,7 +1082,7 @@ def main():
 
     # Testando lazy loading
     print(f"\n=== Testing Lazy Loading ===")
-    lazy_permissions = UserPermissions("lazy_user", {PermissionType.SELECT})
+    lazy_permissions = UserPermissions("lazy_user", PermissionType.SELECT)
     lazy_proxy = DatabaseProxy(db_config, lazy_permissions)
 
     print("Proxy created, but real service not instantiated yet")
@@ -805,6 +1117,8 @@ def main():
     for key, value in final_metrics.items():
         print(f"{key}: {value}")
 
+    wait_for_audit()
+
 
 if __name__ == "__main__":
     main()